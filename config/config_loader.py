@@ -23,6 +23,7 @@ class Config:
     vlm_api_base: str = "http://localhost:8888/v1"
     vlm_api_key: str = "optional-api-key-here"
     vlm_batch_size: int = 10
+    vlm_cache_dir: Optional[str] = None  # VLM 응답 캐시 디렉토리 (None이면 캐시하지 않음)
     vlm_prompts: Dict[str, str] = field(default_factory=dict)
     
     # 로깅 설정
@@ -51,6 +52,7 @@ class Config:
             vlm_api_base=os.getenv("VLM_API_BASE", "http://localhost:8888/v1"),
             vlm_api_key=os.getenv("VLM_API_KEY", "optional-api-key-here"),
             vlm_batch_size=int(os.getenv("VLM_BATCH_SIZE", "10")),
+            vlm_cache_dir=os.getenv("VLM_CACHE_DIR") or None,
             vlm_prompts={},  # TODO: JSON 파싱 지원
             log_level=os.getenv("LOG_LEVEL", "INFO"),
             log_format=os.getenv("LOG_FORMAT", "%(asctime)s - %(name)s - %(levelname)s - %(message)s"),
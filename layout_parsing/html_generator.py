@@ -2,10 +2,12 @@
 JSON 파싱 결과를 HTML로 변환하는 모듈
 text_extractor와 vlm_image_extractor 이후에 실행되어 block_content가 채워진 JSON을 HTML로 변환
 """
+from operator import itemgetter
 from pathlib import Path
-import json
 import logging
 
+from object_parsing.json_io import load_json
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,15 +25,20 @@ def save_json_to_html(data: dict, html_path: Path) -> None:
         parsing_res_list = data.get("parsing_res_list", [])
         
         # block_order 기준으로 정렬
-        def get_sort_key(block):
-            block_order = block.get("block_order")
-            if block_order is not None:
-                return (0, block_order)  # block_order가 있으면 우선순위 0
-            # block_order가 없으면 block_id로 정렬
-            return (1, block.get("block_id", 0))
+        # block_order가 있는 블록은 block_order 순으로 앞에, 없는 블록은 block_id 순으로 뒤에 배치
+        # (두 묶음을 각각 정렬해 이어 붙여 블록마다 (우선순위, 값) 튜플 키를 만들지 않음)
+        ordered_blocks = []
+        unordered_blocks = []
+        for block in parsing_res_list:
+            if block.get("block_order") is not None:
+                ordered_blocks.append(block)
+            else:
+                unordered_blocks.append(block)
+        ordered_blocks.sort(key=itemgetter("block_order"))
+        unordered_blocks.sort(key=lambda block: block.get("block_id", 0))
         
         # 정렬된 블록 리스트
-        sorted_blocks = sorted(parsing_res_list, key=get_sort_key)
+        sorted_blocks = ordered_blocks + unordered_blocks
         
         # HTML 이스케이프 함수
         def escape_html(text):
@@ -187,9 +194,8 @@ def generate_html_from_json_files(parsing_results_dir: Path) -> int:
     generated_count = 0
     for json_file in json_files:
         try:
-            # JSON 파일 읽기
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # JSON 파일 읽기 (바이트로 한 번에 읽어 파싱, orjson이 있으면 C 구현 사용)
+            data = load_json(json_file)
             
             # HTML 파일 경로 생성
             html_path = json_file.with_suffix('.html')
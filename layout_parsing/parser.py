@@ -6,6 +6,11 @@ import json
 import logging
 import sys
 
+try:
+    import ijson
+except ImportError:  # ijson 미설치 시 json.load로 전체 로드
+    ijson = None
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -91,14 +96,50 @@ def convert_image_bbox_to_pdf_bbox(image_bbox: list, image_width: int, image_hei
     return [round(pdf_x1, 2), round(pdf_y1, 2), round(pdf_x2, 2), round(pdf_y2, 2)]
 
 
-def extract_essential_fields(json_path: Path, pdf_path: Path, page_index: int, total_pages: int) -> dict:
+def _load_json_fields(json_path: Path, fields: tuple) -> dict:
+    """
+    JSON 최상위에서 지정한 필드만 읽어 dict로 반환
+    
+    PPStructureV3 결과에는 OCR/레이아웃 검출 원본처럼 쓰지 않는 큰 필드가 함께 들어 있으므로,
+    ijson이 있으면 스트리밍으로 읽으면서 필요한 필드만 객체로 만든다.
+    """
+    if ijson is None:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return {key: data[key] for key in fields if key in data}
+    
+    result = {}
+    current_key = None
+    builder = None
+    with open(json_path, 'rb') as f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if builder is not None:
+                builder.event(event, value)
+                # 필드 값의 prefix는 필드 이름과 같으므로 같은 prefix의 닫힘 이벤트에서 값이 완성됨
+                if prefix == current_key and event in ('end_map', 'end_array'):
+                    result[current_key] = builder.value
+                    builder = None
+                    current_key = None
+            elif current_key is not None:
+                # 필드 값의 첫 이벤트: 컨테이너면 조립 시작, 스칼라면 바로 저장
+                if event in ('start_map', 'start_array'):
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                else:
+                    result[current_key] = value
+                    current_key = None
+            elif prefix == '' and event == 'map_key' and value in fields:
+                current_key = value
+    return result
+
+
+def extract_essential_fields(json_path: Path, pdf_path: Path, page_index: int, total_pages: int, keep_image_bbox: bool = False) -> dict:
     """
     JSON에서 필요한 필드만 추출하고 block_content를 공란으로 설정
     page_index와 page_count를 올바르게 설정
-    image_bbox와 pdf_bbox를 모두 저장
+    pdf_bbox를 저장 (이후 단계는 pdf_bbox만 사용하므로 image_bbox는 keep_image_bbox=True일 때만 저장)
     """
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = _load_json_fields(json_path, ("input_path", "width", "height", "parsing_res_list"))
     
     # PDF 페이지 크기 가져오기
     pdf_width = 0.0
@@ -150,11 +191,12 @@ def extract_essential_fields(json_path: Path, pdf_path: Path, page_index: int, t
         essential_item = {
             "block_label": item.get("block_label", ""),
             "block_content": "",  # 공란으로 설정
-            "image_bbox": image_bbox,  # 이미지 좌표 (픽셀)
-            "pdf_bbox": pdf_bbox,  # PDF 좌표 (포인트)
-            "block_id": item.get("block_id"),
-            "block_order": item.get("block_order"),  # table, figure 등은 null일 수 있음
         }
+        if keep_image_bbox:
+            essential_item["image_bbox"] = image_bbox  # 이미지 좌표 (픽셀)
+        essential_item["pdf_bbox"] = pdf_bbox  # PDF 좌표 (포인트)
+        essential_item["block_id"] = item.get("block_id")
+        essential_item["block_order"] = item.get("block_order")  # table, figure 등은 null일 수 있음
         essential_data["parsing_res_list"].append(essential_item)
     
     logger.debug(f"필수 필드 추출 완료: {len(essential_data['parsing_res_list'])}개 블록")
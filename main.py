@@ -149,7 +149,8 @@ def main():
             parsing_results_dir=parsing_results_dir,
             pdf_pages_dir=pdf_pages_dir,
             vlm_images_dir=vlm_images_dir,
-            output_dir=None  # 원본 파일 덮어쓰기
+            output_dir=None,  # 원본 파일 덮어쓰기
+            max_workers=config.max_workers
         )
         step3_elapsed = time.time() - step3_start
         logger.info(f"✅ VLM 이미지 추출 완료: {len(processed_files)}개 파일")
@@ -203,7 +204,8 @@ def main():
                 vlm_api_key=config.vlm_api_key,
                 vlm_prompts=vlm_prompts,  # 프롬프트 설정 (None이면 기본값 사용)
                 output_dir=None,  # 원본 파일 덮어쓰기
-                batch_size=config.vlm_batch_size
+                batch_size=config.vlm_batch_size,
+                vlm_cache_dir=Path(config.vlm_cache_dir) if config.vlm_cache_dir else None
             )
             step4_elapsed = time.time() - step4_start
             logger.info(f"✅ VLM 처리 완료: {len(processed_files)}개 파일")
@@ -230,7 +232,8 @@ def main():
     
     step5_start = time.time()
     try:
-        hierarchy_main_file, hierarchy_ref_file = process_hierarchy_parsing(
+        # 트리 사전을 함께 받아 6단계에서 방금 저장한 파일을 다시 읽지 않음
+        hierarchy_main_file, hierarchy_ref_file, hierarchy_tree = process_hierarchy_parsing(
             parsing_results_dir=parsing_results_dir,
             output_file=hierarchy_output_file,
             doc_type=doc_type
@@ -247,6 +250,7 @@ def main():
         logger.warning("계층 구조 파싱을 건너뛰고 계속 진행합니다.")
         hierarchy_main_file = None
         hierarchy_ref_file = None
+        hierarchy_tree = None
         # 계층 구조 파싱은 필수이지만, 섹션 내보내기를 위해 경고만
     
     # ============================================================
@@ -264,7 +268,8 @@ def main():
         try:
             section_meta_file = process_section_export(
                 hierarchy_json_path=hierarchy_main_file,
-                output_dir=neo4j_export_dir
+                output_dir=neo4j_export_dir,
+                hierarchy_data=hierarchy_tree
             )
             step6_elapsed = time.time() - step6_start
             logger.info("✅ 섹션별 내보내기 완료")
@@ -12,13 +12,16 @@
 - 법률: 법률 → 편 → 장 → 절 → 관 → 조 → 항 → 호 → 목 → 세목
 """
 
-import json
 import re
+import sys
 from pathlib import Path
-from typing import List, Dict, Optional, Any
-from collections import defaultdict
+from typing import List, Dict, NamedTuple, Optional, Any, Tuple
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 
+from object_parsing.json_io import dump_json, load_json
+
 
 # =============================================================================
 # 상수 정의
@@ -31,6 +34,8 @@ CIRCLED_NUMBERS = {
     '⑪':11, '⑫':12, '⑬':13, '⑭':14, '⑮':15,
     '⑯':16, '⑰':17, '⑱':18, '⑲':19, '⑳':20
 }
+# 항 번호 -> 원문자 (번호 순, 인덱스 = 번호 - 1)
+CIRCLED_MARKERS = tuple(CIRCLED_NUMBERS)
 
 # 로마숫자 (세목)
 ROMAN_NUMERALS = {
@@ -56,6 +61,15 @@ LEVEL_MOK = 8       # 목
 LEVEL_SEMOK = 9     # 세목
 LEVEL_DASH = 10     # 대시
 
+# 새로 나오면 하위 컨텍스트(항 이하 스택, 번호)를 초기화하는 구조 단위 타입
+CONTEXT_RESET_TYPES = frozenset({'편', '장', '절', '관', '조'})
+
+# 항이 새로 나올 때 번호를 0으로 되돌리는 하위 레벨
+HANG_RESET_LEVELS = (LEVEL_HO, LEVEL_MOK, LEVEL_SEMOK)
+
+# HierarchyNode.find 경로 조건에서 가지 번호를 비교하지 않음을 나타내는 표시
+_ANY_BRANCH = object()
+
 # 문서 타입
 DOC_TYPE_INSURANCE = 'insurance'
 DOC_TYPE_LAW = 'law'
@@ -136,9 +150,13 @@ class HierarchyNode:
         current = self
         
         for part in parts:
+            # 경로 조각은 자식마다 다시 해석하지 않고 한 번만 (타입, 번호, 가지 번호) 조건으로 변환
+            target = self._parse_query(part)
+            if target is None:
+                return None
             found = None
             for child in current.children:
-                if self._match_node(child, part):
+                if self._node_matches(child, target):
                     found = child
                     break
             if found:
@@ -147,86 +165,107 @@ class HierarchyNode:
                 return None
         return current
     
-    def _match_node(self, node: 'HierarchyNode', query: str) -> bool:
+    @staticmethod
+    def _parse_query(query: str) -> Optional[Tuple[str, int, Any]]:
+        """
+        경로 조각을 (노드 타입, 번호, 가지 번호) 조건으로 변환 (해석할 수 없으면 None)
+        
+        가지 번호가 _ANY_BRANCH이면 가지 번호는 비교하지 않음
+        """
         # 제N편
         m = re.match(r'제(\d+)편', query)
         if m:
-            return node.type == '편' and node.number == int(m.group(1))
+            return '편', int(m.group(1)), _ANY_BRANCH
         
         # 제N장 또는 제N장의M
         m = re.match(r'제(\d+)장(?:의(\d+))?', query)
         if m:
-            if node.type == '장' and node.number == int(m.group(1)):
-                if m.group(2):
-                    return node.branch == int(m.group(2))
-                return node.branch is None
-            return False
+            return '장', int(m.group(1)), int(m.group(2)) if m.group(2) else None
         
         # 제N절
         m = re.match(r'제(\d+)절', query)
         if m:
-            return node.type == '절' and node.number == int(m.group(1))
+            return '절', int(m.group(1)), _ANY_BRANCH
         
         # 제N조 또는 제N조의M
         m = re.match(r'제(\d+)조(?:의(\d+))?', query)
         if m:
-            if node.type == '조' and node.number == int(m.group(1)):
-                if m.group(2):
-                    return node.branch == int(m.group(2))
-                return node.branch is None
-            return False
+            return '조', int(m.group(1)), int(m.group(2)) if m.group(2) else None
         
         # 제N관
         m = re.match(r'제(\d+)관', query)
         if m:
-            return node.type == '관' and node.number == int(m.group(1))
+            return '관', int(m.group(1)), _ANY_BRANCH
         
         # 원문자 항
         if query in CIRCLED_NUMBERS:
-            return node.type == '항' and node.number == CIRCLED_NUMBERS[query]
+            return '항', CIRCLED_NUMBERS[query], _ANY_BRANCH
         
         # 숫자 호
         if query.isdigit():
-            return node.type == '호' and node.number == int(query)
+            return '호', int(query), _ANY_BRANCH
         
         # 한글 목
         if query in MOK_CHARS:
-            return node.type == '목' and node.number == MOK_CHARS.index(query) + 1
+            return '목', MOK_CHARS.index(query) + 1, _ANY_BRANCH
         
         # 로마숫자 세목
         query_lower = query.strip('()').lower()
         if query_lower in ROMAN_NUMERALS:
-            return node.type == '세목' and node.number == ROMAN_NUMERALS[query_lower]
+            return '세목', ROMAN_NUMERALS[query_lower], _ANY_BRANCH
         
-        return False
+        return None
+    
+    @staticmethod
+    def _node_matches(node: 'HierarchyNode', target: Optional[Tuple[str, int, Any]]) -> bool:
+        """_parse_query로 만든 조건과 노드 비교 (속성 비교만 수행)"""
+        if target is None:
+            return False
+        node_type, number, branch = target
+        if node.type != node_type or node.number != number:
+            return False
+        return branch is _ANY_BRANCH or node.branch == branch
     
     def print_tree(self, indent: int = 0, max_depth: int = 99) -> None:
-        if indent > max_depth:
-            return
-        
-        prefix = "│   " * indent
-        marker_str = f"[{self.marker}]" if self.marker else f"[{self.type}]"
-        title_short = self.title[:35] + "..." if len(self.title) > 35 else self.title
-        ref_count = f" (refs:{len(self.references)})" if self.references else ""
-        
-        print(f"{prefix}├── {marker_str} {title_short}{ref_count}")
+        # 노드마다 print를 부르지 않고 줄을 모아 한 번에 출력 (큰 트리에서 쓰기 호출 수 감소)
+        lines = []
+        stack = [(self, indent)]
+        while stack:
+            node, depth = stack.pop()
+            if depth > max_depth:
+                continue
+            
+            prefix = "│   " * depth
+            marker_str = f"[{node.marker}]" if node.marker else f"[{node.type}]"
+            title_short = node.title[:35] + "..." if len(node.title) > 35 else node.title
+            ref_count = f" (refs:{len(node.references)})" if node.references else ""
+            
+            lines.append(f"{prefix}├── {marker_str} {title_short}{ref_count}\n")
+            
+            # 역순으로 쌓아 자식이 원래 순서대로 출력되도록 함
+            stack.extend((child, depth + 1) for child in reversed(node.children))
         
-        for child in self.children:
-            child.print_tree(indent + 1, max_depth)
+        sys.stdout.write("".join(lines))
+    
+    def iter_nodes(self):
+        """자신과 모든 하위 노드를 문서 순서(전위 순회)로 반환 (재귀 대신 명시적 스택 사용)"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.children:
+                stack.extend(reversed(node.children))
     
     def get_all_by_type(self, node_type: str) -> List['HierarchyNode']:
-        result = []
-        if self.type == node_type:
-            result.append(self)
-        for child in self.children:
-            result.extend(child.get_all_by_type(node_type))
-        return result
+        # 하위 트리마다 리스트를 만들어 이어 붙이지 않고 한 번의 순회로 수집
+        return [node for node in self.iter_nodes() if node.type == node_type]
     
     def get_all_references(self) -> List[Reference]:
         """모든 참조 수집"""
-        refs = list(self.references)
-        for child in self.children:
-            refs.extend(child.get_all_references())
+        refs = []
+        for node in self.iter_nodes():
+            if node.references:
+                refs.extend(node.references)
         return refs
     
     def get_full_text(self) -> str:
@@ -275,6 +314,9 @@ class ReferenceExtractor:
         
         # 호만 참조: "제1호", "제2호의"
         self.re_ho_only = re.compile(r'제\s*(\d+)\s*호')
+        
+        # 항 참조 앞 문맥의 조 언급 확인용
+        self.re_jo_mention = re.compile(r'제\s*\d+\s*조')
     
     def extract(self, content: str, source_id: str, current_jo: Optional[int] = None) -> List[Reference]:
         """
@@ -348,7 +390,7 @@ class ReferenceExtractor:
                     # 주변 컨텍스트 확인 - "제N조"가 근처에 없으면 현재 조 참조
                     context_start = max(0, match.start() - 20)
                     context = content[context_start:match.start()]
-                    if not re.search(r'제\s*\d+\s*조', context):
+                    if not self.re_jo_mention.search(context):
                         ref = Reference(
                             ref_type='internal',
                             source_id=source_id,
@@ -647,6 +689,91 @@ class PatternMatcher:
 # 메인 파서
 # =============================================================================
 
+# 섹션 제목 패턴
+_SECTION_PATTERNS = [
+    # 약관 패턴
+    re.compile(r'^[가-힣A-Za-z0-9\s\(\),，및]+\s*(보통약관|특별약관|추가약관)\s*$'),
+    re.compile(r'^[가-힣A-Za-z0-9\s,，및]+\s*(보통약관|특별약관|추가약관)\s*[\(（][^)）]*[\)）]\s*$'),
+    
+    # 법률 패턴 (동적 - XX법, XX령 등)
+    re.compile(r'^[가-힣]+(?:법|령|규정|규칙)\s*$'),
+    re.compile(r'^【법규\d*】'),
+    
+    # 민원/분쟁/유의사항
+    re.compile(r'^주요\s*(민원|분쟁|사례|유의)'),
+    re.compile(r'^(민원|분쟁)\s*(사례|안내|처리)'),
+    re.compile(r'^유의\s*사항'),
+    re.compile(r'민원.*분쟁.*유의', re.IGNORECASE),
+    re.compile(r'분쟁.*사례.*유의', re.IGNORECASE),
+    
+    # 슬래시 구분 제목
+    re.compile(r'^[가-힣A-Za-z\s]+\s*/\s*[가-힣A-Za-z\s]+'),
+
+]
+
+# 섹션이 아닌 패턴 (문장)
+_NOT_SECTION_PATTERNS = [
+    re.compile(r'^이\s+'),
+    re.compile(r'^본\s+'),
+    re.compile(r'^회사는\s+'),
+    re.compile(r'^보통약관에서\s+'),
+    re.compile(r'^상기'),
+    re.compile(r'합니다\.?\s*$'),
+    re.compile(r'않습니다\.?\s*$'),
+    re.compile(r'됩니다\.?\s*$'),
+    re.compile(r'입니다\.?\s*$'),
+]
+
+# 외부 법률 섹션 패턴 (【법규N】 제목, 단독 법률명)
+_RE_LAW_SECTION = re.compile(r'^【법규\d*】\s*(.+)$')
+_RE_LAW_NAME = re.compile(r'^[가-힣]+(?:법|령|규정|규칙)\s*$')
+
+# 섹션 제목이 될 수 없는 계층 항목 시작 (목, 호, 항, 조)
+_RE_HIERARCHY_PREFIX = re.compile(r'^(?:[가나다라마바사아자차카타파하]\.\s|\d+\.\s|[①②③④⑤⑥⑦⑧⑨⑩]|제\s*\d+\s*조)')
+
+
+def _match_external_law(content: str) -> Optional[str]:
+    """【법규N】 섹션 또는 단독 법률명 블록이면 법률명 반환"""
+    # 【법규N】 패턴: "【법규6】 보험업법 시행령" → "보험업법 시행령"
+    match = _RE_LAW_SECTION.match(content)
+    if match:
+        return match.group(1).strip()
+    
+    # 단독 법률명 (섹션 제목): "민법", "상법" 등
+    if _RE_LAW_NAME.match(content):
+        return content.strip()
+    
+    return None
+
+
+def _is_section_title(content: str) -> bool:
+    """섹션 제목 블록인지 판별"""
+    if not content or len(content) > 80:
+        return False
+    
+    # 계층 패턴 제외
+    if _RE_HIERARCHY_PREFIX.match(content):
+        return False
+    
+    # 문장 패턴 제외
+    if any(p.search(content) for p in _NOT_SECTION_PATTERNS):
+        return False
+    
+    # 섹션 패턴 체크
+    return any(p.match(content) or p.search(content) for p in _SECTION_PATTERNS)
+
+
+def _load_page_blocks(json_file: Path) -> List[Dict]:
+    """페이지 JSON 하나를 읽어 page_index가 표시된 블록 목록 반환"""
+    data = load_json(json_file)
+    page_index = data['page_index']
+    
+    blocks = data['parsing_res_list']
+    for block in blocks:
+        block['page_index'] = page_index
+    return blocks
+
+
 class DocumentParser:
     """보험약관/법률 문서 파서 v4"""
     
@@ -661,6 +788,8 @@ class DocumentParser:
         self.ref_extractor: Optional[ReferenceExtractor] = None  # parse()에서 초기화
         self.stats = defaultdict(int)
         self.all_references: List[Reference] = []
+        # save()에서 저장한 트리 사전 (저장 전에는 None)
+        self.tree_dict: Optional[Dict[str, Any]] = None
         
         # 동적으로 수집되는 정보
         self.external_laws: set = set()      # 【법규N】에서 추출된 법률명
@@ -675,14 +804,15 @@ class DocumentParser:
         json_files = sorted(self.input_dir.glob("page_*_res.json"))
         print(f"파일 수: {len(json_files)}개")
         
-        for json_file in json_files:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                page_index = data['page_index']
-                
-                for block in data['parsing_res_list']:
-                    block['page_index'] = page_index
-                    self.blocks.append(block)
+        # 파일 읽기(I/O)를 스레드로 겹쳐 처리하고, map으로 파일 순서를 유지하여 블록을 이어 붙임
+        # (프로세스 풀은 읽은 블록을 다시 pickle로 돌려받아야 하므로 이득이 없음)
+        if len(json_files) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(json_files))) as executor:
+                for page_blocks in executor.map(_load_page_blocks, json_files):
+                    self.blocks.extend(page_blocks)
+        else:
+            for json_file in json_files:
+                self.blocks.extend(_load_page_blocks(json_file))
         
         print(f"총 블록 수: {len(self.blocks)}개\n")
     
@@ -694,11 +824,13 @@ class DocumentParser:
         print("=" * 80)
         print("외부 법률 수집")
         print("=" * 80)
-        self.external_laws = self._collect_external_laws()
+        # 외부 법률과 섹션은 서로 의존하지 않으므로 블록을 한 번만 훑어 함께 수집
+        self.external_laws, sections = self._scan_blocks()
         if self.external_laws:
-            print(f"감지된 외부 법률 ({len(self.external_laws)}개):")
-            for law in sorted(self.external_laws):
-                print(f"  - {law}")
+            # 법률 수만큼 print를 부르지 않고 한 번에 출력
+            lines = [f"감지된 외부 법률 ({len(self.external_laws)}개):"]
+            lines.extend(f"  - {law}" for law in sorted(self.external_laws))
+            print("\n".join(lines))
         else:
             print("  (【법규】 섹션 없음 - fallback 패턴 사용)")
         
@@ -712,7 +844,6 @@ class DocumentParser:
         print("\n" + "=" * 80)
         print("섹션 감지")
         print("=" * 80)
-        sections = self._detect_sections()
         print(f"섹션 수: {len(sections)}개\n")
         
         # Step 4: 각 섹션 파싱
@@ -720,10 +851,14 @@ class DocumentParser:
         print("계층 파싱")
         print("=" * 80)
         
+        # 섹션별 조 목록은 참조 해석에서도 쓰므로 여기서 한 번만 수집하여 넘김
+        section_jos = []
         for section_info in sections:
             section_node = self._parse_section(section_info)
             self.root.children.append(section_node)
-            jo_count = len(section_node.get_all_by_type('조'))
+            jos = section_node.get_all_by_type('조')
+            section_jos.append((section_node, jos))
+            jo_count = len(jos)
             ref_count = len(section_node.get_all_references())
             print(f"  {section_info['name'][:30]}: 조 {jo_count}개, 참조 {ref_count}개")
         
@@ -731,104 +866,38 @@ class DocumentParser:
         print("\n" + "=" * 80)
         print("참조 해석")
         print("=" * 80)
-        self._resolve_references()
+        self._resolve_references(section_jos)
         
         self._print_stats()
         return self.root
     
-    def _collect_external_laws(self) -> set:
-        """【법규N】 섹션에서 법률명 자동 추출"""
-        laws = set()
-        
-        for block in self.blocks:
-            content = block.get('block_content', '').strip()
-            
-            # 【법규N】 패턴: "【법규6】 보험업법 시행령" → "보험업법 시행령"
-            match = re.match(r'^【법규\d*】\s*(.+)$', content)
-            if match:
-                law_name = match.group(1).strip()
-                laws.add(law_name)
-                continue
-            
-            # 단독 법률명 (섹션 제목): "민법", "상법" 등
-            if re.match(r'^[가-힣]+(?:법|령|규정|규칙)\s*$', content):
-                laws.add(content.strip())
+    def _scan_blocks(self) -> Tuple[set, List[Dict]]:
+        """
+        블록을 한 번만 순회하며 외부 법률 목록과 섹션 목록을 함께 수집
         
-        return laws
-    
-    def _detect_sections(self) -> List[Dict]:
-        """섹션 감지"""
+        Returns:
+            (외부 법률명 집합, 섹션 목록) 튜플
+        """
+        laws = set()
         sections = []
         
-        # 섹션 제목 패턴
-        section_patterns = [
-            # 약관 패턴
-            re.compile(r'^[가-힣A-Za-z0-9\s\(\),，및]+\s*(보통약관|특별약관|추가약관)\s*$'),
-            re.compile(r'^[가-힣A-Za-z0-9\s,，및]+\s*(보통약관|특별약관|추가약관)\s*[\(（][^)）]*[\)）]\s*$'),
-            
-            # 법률 패턴 (동적 - XX법, XX령 등)
-            re.compile(r'^[가-힣]+(?:법|령|규정|규칙)\s*$'),
-            re.compile(r'^【법규\d*】'),
-            
-            # 민원/분쟁/유의사항
-            re.compile(r'^주요\s*(민원|분쟁|사례|유의)'),
-            re.compile(r'^(민원|분쟁)\s*(사례|안내|처리)'),
-            re.compile(r'^유의\s*사항'),
-            re.compile(r'민원.*분쟁.*유의', re.IGNORECASE),
-            re.compile(r'분쟁.*사례.*유의', re.IGNORECASE),
-            
-            # 슬래시 구분 제목
-            re.compile(r'^[가-힣A-Za-z\s]+\s*/\s*[가-힣A-Za-z\s]+'),
-
-        ]
-        
-        # 섹션이 아닌 패턴 (문장)
-        not_section_patterns = [
-            re.compile(r'^이\s+'),
-            re.compile(r'^본\s+'),
-            re.compile(r'^회사는\s+'),
-            re.compile(r'^보통약관에서\s+'),
-            re.compile(r'^상기'),
-            re.compile(r'합니다\.?\s*$'),
-            re.compile(r'않습니다\.?\s*$'),
-            re.compile(r'됩니다\.?\s*$'),
-            re.compile(r'입니다\.?\s*$'),
-        ]
-        
         for i, block in enumerate(self.blocks):
             content = block.get('block_content', '').strip()
             
-            if not content or len(content) > 80:
-                continue
-            
-            # 계층 패턴 제외
-            if re.match(r'^[가나다라마바사아자차카타파하]\.\s', content):
-                continue
-            if re.match(r'^\d+\.\s', content):
-                continue
-            if re.match(r'^[①②③④⑤⑥⑦⑧⑨⑩]', content):
-                continue
-            if re.match(r'^제\s*\d+\s*조', content):
-                continue
-            
-            # 문장 패턴 제외
-            is_sentence = any(p.search(content) for p in not_section_patterns)
-            if is_sentence:
-                continue
-            
-            # 섹션 패턴 체크
-            is_section = any(p.match(content) or p.search(content) for p in section_patterns)
+            law_name = _match_external_law(content)
+            if law_name:
+                laws.add(law_name)
             
-            if is_section:
+            if _is_section_title(content):
                 sections.append({'name': content.strip(), 'index': i})
         
         if not sections:
-            return [{'name': '본문', 'index': 0, 'end': len(self.blocks)}]
+            return laws, [{'name': '본문', 'index': 0, 'end': len(self.blocks)}]
         
         for i in range(len(sections)):
             sections[i]['end'] = sections[i+1]['index'] if i+1 < len(sections) else len(self.blocks)
         
-        return sections
+        return laws, sections
     
     def _parse_section(self, section_info: Dict) -> HierarchyNode:
         """섹션 내부 파싱"""
@@ -1115,7 +1184,7 @@ class DocumentParser:
     def _manage_context(self, stack: Dict, last_numbers: Dict, 
                         node_type: str, node_level: int, node_number: int, page: int):
         """컨텍스트 관리"""
-        if node_type in ('편', '장', '절', '관', '조'):
+        if node_type in CONTEXT_RESET_TYPES:
             self._reset_stack_below(stack, node_level)
             for lvl in range(node_level + 1, LEVEL_DASH + 1):
                 if lvl in last_numbers:
@@ -1123,7 +1192,7 @@ class DocumentParser:
         
         elif node_type == '항':
             self._reset_stack_below(stack, LEVEL_HANG)
-            for lvl in [LEVEL_HO, LEVEL_MOK, LEVEL_SEMOK]:
+            for lvl in HANG_RESET_LEVELS:
                 last_numbers[lvl] = 0
         
         elif node_type == '호':
@@ -1169,31 +1238,44 @@ class DocumentParser:
                 stack[LEVEL_HANG] = auto_hang
                 self.stats['항(자동)'] += 1
     
+    # 스택 키는 LEVEL_SECTION(0)부터 LEVEL_DASH(10)까지의 작은 정수이므로
+    # 키를 매번 정렬하지 않고 레벨 번호를 깊은 쪽부터 직접 조회
     def _find_parent(self, stack: Dict, child_level: int) -> HierarchyNode:
-        for lvl in sorted(stack.keys(), reverse=True):
-            if lvl < child_level and stack[lvl] is not None:
-                return stack[lvl]
+        for lvl in range(child_level - 1, -1, -1):
+            node = stack.get(lvl)
+            if node is not None:
+                return node
         return stack.get(LEVEL_SECTION, list(stack.values())[0])
     
     def _find_parent_for_special(self, stack: Dict) -> HierarchyNode:
         deepest_level = max(stack.keys())
-        for lvl in sorted(stack.keys(), reverse=True):
-            if lvl < deepest_level and stack[lvl] is not None:
-                return stack[lvl]
+        for lvl in range(deepest_level - 1, -1, -1):
+            node = stack.get(lvl)
+            if node is not None:
+                return node
         return stack.get(LEVEL_SECTION, list(stack.values())[0])
     
     def _find_most_recent(self, stack: Dict) -> Optional[HierarchyNode]:
-        for lvl in sorted(stack.keys(), reverse=True):
-            if stack[lvl] is not None:
-                return stack[lvl]
+        for lvl in range(max(stack, default=-1), -1, -1):
+            node = stack.get(lvl)
+            if node is not None:
+                return node
         return None
     
-    def _resolve_references(self):
-        """참조 해석 - resolved_id 설정"""
+    def _resolve_references(self, section_jos: Optional[List[Tuple[HierarchyNode, List[HierarchyNode]]]] = None):
+        """
+        참조 해석 - resolved_id 설정
+        
+        Args:
+            section_jos: (섹션 노드, 섹션의 조 노드 목록) 리스트 (None이면 트리에서 다시 수집)
+        """
+        if section_jos is None:
+            section_jos = [(section, section.get_all_by_type('조')) for section in self.root.children]
+        
         # 모든 조 수집
         all_jos = {}
-        for section in self.root.children:
-            for jo in section.get_all_by_type('조'):
+        for section, jos in section_jos:
+            for jo in jos:
                 key = (section.id, jo.number, jo.branch)
                 all_jos[key] = jo.id
         
@@ -1209,7 +1291,7 @@ class DocumentParser:
                     parts = [base_id]
                     
                     if ref.target_hang:
-                        hang_marker = list(CIRCLED_NUMBERS.keys())[ref.target_hang - 1] if ref.target_hang <= 20 else f"제{ref.target_hang}항"
+                        hang_marker = CIRCLED_MARKERS[ref.target_hang - 1] if ref.target_hang <= 20 else f"제{ref.target_hang}항"
                         parts.append(hang_marker)
                     
                     if ref.target_ho:
@@ -1224,20 +1306,18 @@ class DocumentParser:
         print(f"  해석된 참조: {resolved_count}개 / 전체 {len(self.all_references)}개")
     
     def _print_stats(self):
-        print("\n" + "=" * 80)
-        print("파싱 통계")
-        print("=" * 80)
+        # 통계 줄을 모아 한 번에 출력
+        lines = ["\n" + "=" * 80, "파싱 통계", "=" * 80]
         
         order = ['편', '장', '절', '관', '조', '항', '항(자동)', '호', '목', '세목', '대시', 'special']
-        for key in order:
-            if key in self.stats:
-                print(f"  {key}: {self.stats[key]}개")
-        
-        print(f"\n  총 참조: {len(self.all_references)}개")
-        internal = sum(1 for r in self.all_references if r.ref_type == 'internal')
-        external = sum(1 for r in self.all_references if r.ref_type == 'external')
-        print(f"    - 내부 참조: {internal}개")
-        print(f"    - 외부 참조: {external}개")
+        lines.extend(f"  {key}: {self.stats[key]}개" for key in order if key in self.stats)
+        
+        lines.append(f"\n  총 참조: {len(self.all_references)}개")
+        # 참조 유형별 개수를 한 번에 집계
+        ref_type_counts = Counter(r.ref_type for r in self.all_references)
+        lines.append(f"    - 내부 참조: {ref_type_counts['internal']}개")
+        lines.append(f"    - 외부 참조: {ref_type_counts['external']}개")
+        print("\n".join(lines))
     
     def save(self, output_path: str) -> tuple[Path, Path]:
         """
@@ -1252,15 +1332,14 @@ class DocumentParser:
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
-        # 메인 트리 저장
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(self.root.to_dict(), f, ensure_ascii=False, indent=2)
+        # 메인 트리 저장 (저장한 사전은 다음 단계에서 파일을 다시 읽지 않도록 보관)
+        self.tree_dict = self.root.to_dict()
+        dump_json(self.tree_dict, output_file, pretty=True)
         print(f"\n트리 저장: {output_file}")
         
         # 참조 목록 별도 저장
         ref_file = output_file.parent / f"{output_file.stem}_references.json"
-        with open(ref_file, 'w', encoding='utf-8') as f:
-            json.dump([r.to_dict() for r in self.all_references], f, ensure_ascii=False, indent=2)
+        dump_json([r.to_dict() for r in self.all_references], ref_file, pretty=True)
         print(f"참조 저장: {ref_file}")
         
         return output_file, ref_file
@@ -1271,8 +1350,7 @@ class DocumentParser:
 # =============================================================================
 
 def load_document(json_path: str) -> HierarchyNode:
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(json_path)
     return _dict_to_node(data)
 
 
@@ -1315,11 +1393,19 @@ def _dict_to_node(data: Dict) -> HierarchyNode:
 # 파이프라인 함수
 # =============================================================================
 
+class HierarchyParseResult(NamedTuple):
+    """계층 구조 파싱 결과"""
+    main_file: Path
+    ref_file: Path
+    # 저장한 트리 사전 (바로 이어서 섹션 내보내기를 할 때 파일을 다시 읽지 않도록 넘겨줌)
+    tree: Dict[str, Any]
+
+
 def process_hierarchy_parsing(
     parsing_results_dir: Path,
     output_file: Path,
     doc_type: str = DOC_TYPE_INSURANCE
-) -> tuple[Path, Path]:
+) -> HierarchyParseResult:
     """
     계층 구조 파싱 실행
     
@@ -1329,12 +1415,12 @@ def process_hierarchy_parsing(
         doc_type: 문서 타입 (DOC_TYPE_INSURANCE 또는 DOC_TYPE_LAW)
     
     Returns:
-        (메인 파일 경로, 참조 파일 경로) 튜플
+        HierarchyParseResult (메인 파일 경로, 참조 파일 경로, 트리 사전)
     """
     parser = DocumentParser(str(parsing_results_dir), doc_type=doc_type)
     root = parser.parse()
     main_file, ref_file = parser.save(str(output_file))
-    return main_file, ref_file
+    return HierarchyParseResult(main_file, ref_file, parser.tree_dict)
 
 
 # =============================================================================
@@ -1362,12 +1448,15 @@ def main():
     print("\n" + "=" * 80)
     print("참조 예시 (처음 10개)")
     print("=" * 80)
+    lines = []
     for ref in parser.all_references[:10]:
-        print(f"  [{ref.ref_type}] {ref.raw_text}")
-        print(f"    → 대상: 조{ref.target_jo}, 항{ref.target_hang}, 호{ref.target_ho}")
+        lines.append(f"  [{ref.ref_type}] {ref.raw_text}")
+        lines.append(f"    → 대상: 조{ref.target_jo}, 항{ref.target_hang}, 호{ref.target_ho}")
         if ref.resolved_id:
-            print(f"    → 해석: {ref.resolved_id}")
-        print()
+            lines.append(f"    → 해석: {ref.resolved_id}")
+        lines.append("")
+    if lines:
+        print("\n".join(lines))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,64 @@
+"""파이프라인 공용 JSON 입출력 (orjson이 있으면 C 구현 사용)"""
+from pathlib import Path
+from typing import Any
+import json
+import mmap
+import os
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 표준 json 모듈 사용
+    orjson = None
+
+# 이 크기 이상인 파일만 mmap으로 읽음 (작은 파일은 매핑 비용이 복사 비용보다 큼)
+_MMAP_MIN_SIZE = 1024 * 1024
+
+
+def load_json(json_path: Path) -> Any:
+    """JSON 파일 로드 (orjson이 있으면 C 구현 파서 사용)"""
+    # 두 경로 모두 바이트로 한 번에 읽어 텍스트 스트림 디코딩 단계를 거치지 않음
+    with open(json_path, 'rb') as f:
+        # 큰 파일은 mmap 버퍼를 orjson에 바로 넘겨 파일 전체를 bytes로 복사하지 않음
+        if orjson is not None and os.fstat(f.fileno()).st_size >= _MMAP_MIN_SIZE:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as buf:
+                return orjson.loads(buf)
+        payload = f.read()
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def is_pretty_json_enabled() -> bool:
+    """DOCLAYOUT_DEBUG 환경 변수가 켜져 있으면 사람이 읽기 좋은 들여쓰기 출력 사용"""
+    return os.getenv("DOCLAYOUT_DEBUG", "false").lower() in ("1", "true", "yes")
+
+
+def serialize_json(data: Any, pretty: bool = False) -> bytes:
+    """
+    JSON 직렬화 (orjson이 있으면 C 구현 직렬화 사용)
+    
+    다음 단계는 프로그램이 읽으므로 기본은 공백 없는 compact 출력,
+    pretty=True일 때만 들여쓰기 2칸
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+
+
+def atomic_write(output_file: Path, payload: bytes) -> None:
+    """임시 파일에 쓴 뒤 교체 (쓰기 도중 실패해도 기존 파일이 깨지지 않음)"""
+    output_file = Path(output_file)
+    tmp_file = output_file.with_name(output_file.name + ".tmp")
+    with open(tmp_file, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_file, output_file)
+
+
+def dump_json(data: Any, output_file: Path, pretty: bool = False) -> None:
+    """JSON 파일 저장"""
+    atomic_write(output_file, serialize_json(data, pretty))
@@ -16,6 +16,8 @@ from pathlib import Path
 from typing import List, Dict, Optional, Any
 from dataclasses import dataclass, field
 
+from object_parsing.json_io import load_json
+
 
 # =============================================================================
 # 데이터 클래스
@@ -50,6 +52,26 @@ class EmbeddingData:
     page: int
 
 
+# =============================================================================
+# 트리 순회
+# =============================================================================
+
+def _iter_preorder(children: List[Dict]):
+    """
+    하위 노드들을 문서 순서(전위 순회)로 반환
+    
+    노드마다 재귀 호출 프레임을 만들지 않도록 명시적 스택 사용
+    (깊은 트리에서도 재귀 한도에 걸리지 않음)
+    """
+    stack = list(reversed(children))
+    while stack:
+        node = stack.pop()
+        yield node
+        grandchildren = node.get('children')
+        if grandchildren:
+            stack.extend(reversed(grandchildren))
+
+
 # =============================================================================
 # 메인 Exporter 클래스
 # =============================================================================
@@ -73,10 +95,12 @@ class SectionExporter:
         'special': 'Special'
     }
     
-    def __init__(self, hierarchy_json_path: str, output_dir: str):
+    def __init__(self, hierarchy_json_path: str, output_dir: str, root: Optional[Dict] = None):
         self.hierarchy_path = Path(hierarchy_json_path)
         self.output_dir = Path(output_dir)
-        self.root = None
+        # 이미 메모리에 있는 트리를 넘기면 load()에서 파일을 다시 읽지 않음
+        self.root = root
+        self.base_section_id = None
         
         # 출력 디렉토리 생성
         (self.output_dir / "sections").mkdir(parents=True, exist_ok=True)
@@ -91,11 +115,17 @@ class SectionExporter:
         logger.info("트리 로드")
         logger.info("=" * 80)
         
-        with open(self.hierarchy_path, 'r', encoding='utf-8') as f:
-            self.root = json.load(f)
+        if self.root is None:
+            self.root = load_json(self.hierarchy_path)
         
         section_count = len(self.root.get('children', []))
         logger.info(f"  섹션 수: {section_count}개\n")
+        
+        # EXTENDS 대상(보통약관) 섹션 ID는 섹션마다 다시 찾지 않도록 한 번만 조회
+        self.base_section_id = next(
+            (child.get('id') for child in self.root.get('children', []) if '보통약관' in child.get('title', '')),
+            None
+        )
     
     def export(self):
         """전체 내보내기 실행"""
@@ -212,30 +242,21 @@ class SectionExporter:
     def _detect_extends_relation(self, section: Dict) -> Optional[str]:
         """EXTENDS 관계 감지 (추가약관/특별약관 → 보통약관)"""
         section_name = section.get('title', '')
-        content = self._get_section_full_text(section)
         
-        # 추가약관이 보통약관을 확장하는 패턴
+        # 추가약관이 보통약관을 확장하는 패턴 (해당 섹션일 때만 본문 전체를 모음)
         if '추가약관' in section_name or '특별약관' in section_name:
+            content = self._get_section_full_text(section)
             # "보통약관 제N조를 변경", "보통약관에 불구하고" 등
             if '보통약관' in content:
-                # 보통약관 섹션 ID 찾기
-                for child in self.root.get('children', []):
-                    if '보통약관' in child.get('title', ''):
-                        return child.get('id')
+                # 보통약관 섹션 ID (load에서 미리 찾아 둠)
+                return self.base_section_id
         
         return None
     
     def _get_section_full_text(self, section: Dict) -> str:
         """섹션 전체 텍스트 추출"""
         texts = [section.get('content', '')]
-        
-        def collect_text(node):
-            texts.append(node.get('content', ''))
-            for child in node.get('children', []):
-                collect_text(child)
-        
-        for child in section.get('children', []):
-            collect_text(child)
+        texts.extend(node.get('content', '') for node in _iter_preorder(section.get('children', [])))
         
         return '\n'.join(texts)
     
@@ -276,8 +297,11 @@ class SectionExporter:
     
     def _process_children(self, parent_id: str, children: List[Dict], 
                           nodes: List[Dict], edges: List[Dict]):
-        """하위 노드 재귀 처리"""
-        for child in children:
+        """하위 노드 처리 (문서 순서대로, 명시적 스택으로 순회)"""
+        # (부모 ID, 노드) 쌍을 역순으로 쌓아 pop 순서가 전위 순회가 되도록 함
+        stack = [(parent_id, child) for child in reversed(children)]
+        while stack:
+            parent_id, child = stack.pop()
             child_id = child.get('id', '')
             child_type = child.get('type', '')
             label = self.LABEL_MAP.get(child_type, 'Node')
@@ -333,20 +357,19 @@ class SectionExporter:
                         }
                     })
             
-            # 재귀 처리
-            self._process_children(
-                parent_id=child_id,
-                children=child.get('children', []),
-                nodes=nodes,
-                edges=edges
-            )
+            # 하위 노드
+            grandchildren = child.get('children')
+            if grandchildren:
+                stack.extend((child_id, grandchild) for grandchild in reversed(grandchildren))
     
     def _prepare_embeddings(self, section: Dict, section_name: str) -> List[Dict]:
         """조 단위 임베딩 데이터 준비"""
         embeddings = []
         
-        def find_jo_nodes(node: Dict, parent_context: str = ""):
-            """조 노드 찾아서 임베딩 준비"""
+        # 조 노드 찾아서 임베딩 준비 ((노드, 관 이름 컨텍스트) 쌍을 스택으로 전위 순회)
+        stack = [(child, "") for child in reversed(section.get('children', []))]
+        while stack:
+            node, parent_context = stack.pop()
             node_type = node.get('type', '')
             
             if node_type == '조':
@@ -392,13 +415,10 @@ class SectionExporter:
             if node_type == '관':
                 new_context = node.get('title', '')
             
-            # 자식 재귀
-            for child in node.get('children', []):
-                find_jo_nodes(child, new_context)
-        
-        # 섹션의 모든 자식 탐색
-        for child in section.get('children', []):
-            find_jo_nodes(child)
+            # 자식 탐색
+            grandchildren = node.get('children')
+            if grandchildren:
+                stack.extend((child, new_context) for child in reversed(grandchildren))
         
         return embeddings
     
@@ -417,19 +437,14 @@ class SectionExporter:
             texts.append(content)
         
         # 자식 노드 (마커 + 내용)
-        def collect_children(children, depth=0):
-            for child in children:
-                child_marker = child.get('marker', '')
-                child_content = child.get('content', '')
-                
-                if child_marker:
-                    texts.append(f"{child_marker} {child_content}")
-                elif child_content:
-                    texts.append(child_content)
-                
-                collect_children(child.get('children', []), depth + 1)
-        
-        collect_children(node.get('children', []))
+        for child in _iter_preorder(node.get('children', [])):
+            child_marker = child.get('marker', '')
+            child_content = child.get('content', '')
+            
+            if child_marker:
+                texts.append(f"{child_marker} {child_content}")
+            elif child_content:
+                texts.append(child_content)
         
         return '\n'.join(texts)
     
@@ -453,7 +468,8 @@ class SectionExporter:
 
 def process_section_export(
     hierarchy_json_path: Path,
-    output_dir: Path
+    output_dir: Path,
+    hierarchy_data: Optional[Dict] = None
 ) -> Path:
     """
     섹션별 JSON 분리 및 Neo4j/Embedding 준비
@@ -461,11 +477,12 @@ def process_section_export(
     Args:
         hierarchy_json_path: document_hierarchy.json 파일 경로
         output_dir: 출력 디렉토리 경로
+        hierarchy_data: 이미 메모리에 있는 트리 사전 (None이면 hierarchy_json_path에서 읽음)
     
     Returns:
         document_meta.json 파일 경로
     """
-    exporter = SectionExporter(str(hierarchy_json_path), str(output_dir))
+    exporter = SectionExporter(str(hierarchy_json_path), str(output_dir), root=hierarchy_data)
     exporter.export()
     return output_dir / "document_meta.json"
 
@@ -1,12 +1,21 @@
 """PyMuPDF를 사용한 텍스트 추출 (박스 감지 기능 포함)"""
 import fitz  # PyMuPDF
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
-import json
+from typing import List, Dict, Any, Optional, Tuple, Union
 import re
 import logging
+import os
 import sys
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import threading
+import multiprocessing
+import atexit
+from collections import Counter, OrderedDict
+from contextlib import nullcontext
+from functools import lru_cache
+from operator import itemgetter
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from object_parsing.json_io import atomic_write, dump_json, is_pretty_json_enabled, load_json, serialize_json
 
 # 개선된 박스 감지 모듈 import
 from object_parsing.box_detector import (
@@ -14,16 +23,41 @@ from object_parsing.box_detector import (
     find_containing_box_improved
 )
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# 로깅 설정 (이미 핸들러가 설정된 경우(워커 재import 등)에는 건너뜀)
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
 logger = logging.getLogger(__name__)
 
+# 구두점/괄호 붙임 규칙용 정규식 (모듈 로드 시 1회 컴파일)
+# "공백+(", ")+공백", "공백+,/." 세 규칙을 하나의 패턴으로 합쳐 한 번의 스캔으로 처리
+# (매칭되지 않은 그룹은 빈 문자열로 치환되므로 r'\1\2\3' 하나로 세 규칙을 모두 표현)
+_RE_PUNCTUATION = re.compile(r'\s+(\()|(\))\s+|\s+([,\.])')
+
+# 문자 유형 판별용 코드포인트 범위 (한글 음절 가-힣, CJK 통합 한자)
+_HANGUL_RANGE = (0xAC00, 0xD7A3)
+_HANJA_RANGE = (0x4E00, 0x9FFF)
+
+# 문자 dict 정렬 키 (lambda 호출 없이 C 수준에서 x0 조회)
+_CHAR_X0 = itemgetter("x0")
+
+# 텍스트 추출 플래그 (기본값에서 이미지 블록 포함만 제외)
+_RAWDICT_FLAGS = fitz.TEXTFLAGS_RAWDICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+# 설치된 PyMuPDF가 rawdict 추출을 지원하는지 (프로세스당 한 번만 확인)
+_RAWDICT_SUPPORTED = hasattr(fitz.TextPage, "extractRAWDICT")
+
+# 텍스트 추출 대상 블록 라벨
+_TEXT_BLOCK_LABELS = frozenset({"doc_title", "paragraph_title", "text", "figure_title", "header", "vision_footnote"})
+
+# 문자 bbox가 없을 때의 기본값 (문자마다 새 리스트를 만들지 않도록 공유)
+_ZERO_BBOX = (0, 0, 0, 0)
+
 
 # =============================================================================
 # 박스(사각형) 감지 함수들
@@ -268,42 +302,70 @@ def _remove_duplicate_chars(chars: List[Dict]) -> List[Dict]:
     if not chars:
         return []
     
+    # y0를 3pt 단위로 반올림한 정수 구간 번호로 묶음 (곱셈으로 좌표를 되돌릴 필요 없음)
     y_tolerance = 3.0
     y_groups = {}
     for char in chars:
-        y_rounded = round(char["y0"] / y_tolerance) * y_tolerance
-        if y_rounded not in y_groups:
-            y_groups[y_rounded] = []
-        y_groups[y_rounded].append(char)
+        y_groups.setdefault(round(char["y0"] / y_tolerance), []).append(char)
     
     result = []
     for y_key, line_chars in y_groups.items():
-        line_chars.sort(key=lambda c: c["x0"])
+        line_chars.sort(key=_CHAR_X0)
+        
+        # 같은 글자가 두 번 이상 나오지 않으면 중복이 있을 수 없으므로 거리 검사 생략
+        # (겹쳐 찍힌 페이지가 아닌 대부분의 경우 짧은 줄은 여기서 끝남)
+        if len({c["char"] for c in line_chars}) == len(line_chars):
+            result.extend(line_chars)
+            continue
         
-        filtered = []
+        # 중심 좌표를 2pt 격자로 나눈 버킷 (같은 글자끼리만 비교)
+        # 거리 2.0 미만인 중복은 반드시 같은 버킷이나 인접 버킷에 있으므로 3x3 이웃만 확인
+        # 버킷에는 dict 대신 중심 좌표 튜플만 보관하여 내부 루프의 키 조회를 줄임
+        seen = {}
         for char in line_chars:
+            # 중심 좌표는 중복 검사에서만 쓰이므로 문자 dict에 저장하지 않고 여기서 계산
+            cx = (char["x0"] + char["x1"]) / 2
+            cy = (char["y0"] + char["y1"]) / 2
+            c = char["char"]
+            bx = int(cx // 2)
+            by = int(cy // 2)
             is_duplicate = False
-            for existing in filtered:
-                dist = ((char["center_x"] - existing["center_x"]) ** 2 + 
-                       (char["center_y"] - existing["center_y"]) ** 2) ** 0.5
-                
-                if dist < 2.0 and char["char"] == existing["char"]:
-                    is_duplicate = True
+            for nx in (bx - 1, bx, bx + 1):
+                for ny in (by - 1, by, by + 1):
+                    bucket = seen.get((nx, ny, c))
+                    if bucket is None:
+                        continue
+                    for ex, ey in bucket:
+                        ddx = cx - ex
+                        ddy = cy - ey
+                        if ddx * ddx + ddy * ddy < 4.0:
+                            is_duplicate = True
+                            break
+                    if is_duplicate:
+                        break
+                if is_duplicate:
                     break
             
             if not is_duplicate:
-                filtered.append(char)
-        
-        result.extend(filtered)
+                seen.setdefault((bx, by, c), []).append((cx, cy))
+                result.append(char)
     
     return result
 
 
+@lru_cache(maxsize=None)
 def _get_char_type(char: str) -> str:
-    """문자 유형 분류"""
-    if re.match(r'[가-힣]', char):
+    """
+    문자 유형 분류 (같은 글자가 반복되므로 프로세스 단위로 캐시)
+    
+    키는 문서에 등장하는 글자 종류 수로 제한되므로 크기 제한 없는 캐시를 사용
+    (LRU 순서 갱신 비용 없이 dict 조회 한 번)
+    """
+    # 첫 글자의 코드포인트 범위로 판별 (정규식 매칭 불필요)
+    cp = ord(char[0])
+    if _HANGUL_RANGE[0] <= cp <= _HANGUL_RANGE[1]:
         return "korean"
-    elif re.match(r'[\u4e00-\u9fff]', char):
+    elif _HANJA_RANGE[0] <= cp <= _HANJA_RANGE[1]:
         return "hanja"
     elif char.isdigit():
         return "number"
@@ -317,200 +379,470 @@ def _get_char_type(char: str) -> str:
 
 def _apply_punctuation_rules(text: str) -> str:
     """구두점/괄호 붙임 규칙 적용"""
-    text = re.sub(r'\s+\(', '(', text)
-    text = re.sub(r'\)\s+', ')', text)
-    text = re.sub(r'\s+([,\.])', r'\1', text)
-    return text
+    # 대상 문자가 하나도 없으면 정규식 스캔 생략
+    if not any(c in text for c in '().,'):
+        return text
+    return _RE_PUNCTUATION.sub(r'\1\2\3', text)
 
 
-def extract_text_with_font_info_from_pdf_bbox(
-    pdf_path: Path, 
-    pdf_bbox: List[float], 
-    page_index: int = 0
-) -> Dict[str, Any]:
+def _normalize_spaces_and_punct(text: str) -> str:
     """
-    PDF에서 지정된 bbox 영역의 텍스트와 폰트 정보를 추출
+    조립된 텍스트의 후처리 (구두점 붙임, \\" 제거, 공백 정리)
+    
+    각 단계가 C 구현 연산 한 번씩이므로 Python 문자 단위 루프로 합치지 않는다.
     """
-    if len(pdf_bbox) != 4:
-        return {"text": "", "text_length": 0, "font_size": None, "is_bold": None, "font_name": None}
+    # \"는 두 글자 패턴이라 str.translate로 처리할 수 없고, 개행은 아래 split()이 함께 처리하므로
+    # 별도 치환표 없이 replace 한 번으로 충분함 (구두점 규칙 뒤에 제거해야 기존 결과와 같음)
+    text = _apply_punctuation_rules(text).replace('\\"', '')
+    # str.split()은 모든 공백(개행/탭 포함)을 기준으로 나누므로 공백 정리와 strip을 한 번에 처리
+    return " ".join(text.split())
+
+
+def _empty_text_info() -> Dict[str, Any]:
+    """텍스트를 추출하지 못한 경우의 기본 결과"""
+    return {"text": "", "text_length": 0, "font_size": None, "is_bold": None, "font_name": None}
+
+
+# 워커 단위 PDF 문서 캐시: (실제 경로, mtime) -> {"doc": 문서, "pages": {페이지 번호: (span 목록, span 색인)}}
+# mtime을 키에 포함하여 파일이 바뀌면 새로 연다.
+_DOC_CACHE_SIZE = 8
+_DOC_CACHE: "OrderedDict[Tuple[str, float], Dict[str, Any]]" = OrderedDict()
+_DOC_CACHE_LOCK = threading.Lock()
+
+# PyMuPDF는 스레드 안전하지 않고 캐시된 문서를 스레드끼리 공유하므로
+# 문서 조회/열기/페이지 로드/텍스트·도형 추출은 한 번에 한 스레드만 수행
+# (잠금 순서: _FITZ_LOCK -> _DOC_CACHE_LOCK)
+_FITZ_LOCK = threading.Lock()
+
+
+def _get_doc_entry(pdf_path: Path) -> Dict[str, Any]:
+    """
+    캐시된 문서 항목 반환 (없으면 열어서 등록, 호출 측에서 _FITZ_LOCK을 잡고 있어야 함)
     
-    try:
-        doc = fitz.open(str(pdf_path))
-        if page_index >= len(doc):
-            doc.close()
-            return {"text": "", "text_length": 0, "font_size": None, "is_bold": None, "font_name": None}
-        
-        page = doc[page_index]
-        x1, y1, x2, y2 = pdf_bbox
-        rect = fitz.Rect(x1, y1, x2, y2)
+    문서는 _FITZ_LOCK 안에서만 사용되므로 캐시에서 밀려난 문서는
+    다른 스레드가 쓰고 있을 수 없어 바로 close한다.
+    """
+    # 같은 파일을 상대/절대 경로로 부르더라도 한 항목을 쓰도록 실제 경로로 키를 만듦
+    resolved = os.path.realpath(pdf_path)
+    key = (resolved, os.path.getmtime(resolved))
+    with _DOC_CACHE_LOCK:
+        entry = _DOC_CACHE.get(key)
+        if entry is not None:
+            _DOC_CACHE.move_to_end(key)
+            return entry
         
+        doc = fitz.open(key[0])
+        # 같은 PDF가 반복해서 열리면 캐시가 제대로 동작하지 않는 것이므로 열 때마다 기록
+        logger.debug(f"PDF 열기: {pdf_path.name} ({doc.page_count}페이지)")
+        entry = {"doc": doc, "pages": {}}
+        _DOC_CACHE[key] = entry
+        while len(_DOC_CACHE) > _DOC_CACHE_SIZE:
+            _, evicted = _DOC_CACHE.popitem(last=False)
+            try:
+                evicted["doc"].close()
+            except Exception:
+                pass
+        return entry
+
+
+def _close_cached_docs() -> None:
+    """프로세스 종료 시 캐시에 남은 문서를 닫음"""
+    with _FITZ_LOCK, _DOC_CACHE_LOCK:
+        for entry in _DOC_CACHE.values():
+            try:
+                entry["doc"].close()
+            except Exception:
+                pass
+        _DOC_CACHE.clear()
+
+
+atexit.register(_close_cached_docs)
+
+
+def _get_cached_doc(pdf_path: Path) -> fitz.Document:
+    """캐시된 PDF 문서 반환 (호출자가 close하지 않으며, _FITZ_LOCK을 잡은 동안만 사용)"""
+    return _get_doc_entry(pdf_path)["doc"]
+
+
+def _prepare_span_chars(span: Dict, span_id: int) -> None:
+    """
+    span의 문자 레코드를 페이지당 한 번만 만들어 span에 보관
+    
+    - char_centers: (중심 x, 중심 y, 문자 dict) 튜플 목록 (bbox 질의 시 포함 검사용)
+    - char_dicts: 문자 dict 목록 (span 전체가 질의 영역 안에 들면 검사 없이 그대로 사용)
+    - char_extent: 문자 bbox 전체를 감싸는 영역 (문자가 없으면 None)
+    
+    문자 dict는 이후 단계에서 수정되지 않으므로 여러 질의가 같은 객체를 공유한다.
+    span 경계는 문자마다 따로 담지 않고 정수 span_id 하나로 표시한다.
+    """
+    span["span_id"] = span_id
+    char_centers = []
+    char_dicts = []
+    for char_info in span.get("chars", ()):
+        char_text = char_info.get("c", "")
+        char_bbox = char_info.get("bbox", _ZERO_BBOX)
+        if len(char_bbox) >= 4 and char_text:
+            char_x0, char_y0, char_x1, char_y1 = char_bbox[0], char_bbox[1], char_bbox[2], char_bbox[3]
+            char = {
+                "char": char_text,
+                "x0": char_x0,
+                "y0": char_y0,
+                "x1": char_x1,
+                "y1": char_y1,
+                "span_id": span_id
+            }
+            char_centers.append(((char_x0 + char_x1) / 2, (char_y0 + char_y1) / 2, char))
+            char_dicts.append(char)
+    
+    span["char_centers"] = char_centers
+    span["char_dicts"] = char_dicts
+    if char_dicts:
+        span["char_extent"] = (
+            min(c["x0"] for c in char_dicts),
+            min(c["y0"] for c in char_dicts),
+            max(c["x1"] for c in char_dicts),
+            max(c["y1"] for c in char_dicts)
+        )
+    else:
+        span["char_extent"] = None
+
+
+def _collect_page_spans(page: fitz.Page) -> List[Dict]:
+    """
+    페이지 전체 텍스트를 한 번만 추출하여 span 목록으로 평탄화
+    
+    bbox마다 clip 추출을 반복하면 MuPDF가 매번 페이지를 다시 훑으므로,
+    한 번 추출한 결과를 bbox별로 Python에서 잘라 쓴다.
+    """
+    # 이미지 블록은 사용하지 않으므로 MuPDF가 이미지 데이터를 만들지 않도록 제외
+    # TextPage를 직접 만들어 rawdict 추출이 실패해도 같은 TextPage에서 dict로 다시 추출
+    textpage = page.get_textpage(flags=_RAWDICT_FLAGS)
+    if _RAWDICT_SUPPORTED:
         try:
-            text_dict = page.get_text("rawdict", clip=rect)
+            text_dict = textpage.extractRAWDICT()
         except Exception:
-            text_dict = page.get_text("dict", clip=rect)
+            text_dict = textpage.extractDICT()
+    else:
+        text_dict = textpage.extractDICT()
+    del textpage
+    return _spans_from_text_dict(text_dict)
+
+
+def _spans_from_text_dict(text_dict: Dict) -> List[Dict]:
+    """get_text("rawdict"/"dict") 결과를 문자 레코드가 준비된 span 목록으로 평탄화"""
+    spans = []
+    # 가로 경계(x0, x1)가 같은 span은 같은 번호를 받음 (줄 조립 시 같은 span 판정 기준)
+    span_ids = {}
+    for block in text_dict.get("blocks", []):
+        if "lines" not in block:
+            continue
+        for line in block.get("lines", []):
+            for span in line.get("spans", []):
+                span_bbox = span.get("bbox", [])
+                if len(span_bbox) >= 4:
+                    span_id = span_ids.setdefault((span_bbox[0], span_bbox[2]), len(span_ids))
+                    _prepare_span_chars(span, span_id)
+                    # 어떤 bbox 질의에서도 문자를 내지 못하는 span은 색인에 넣지 않음
+                    # (문자 목록이 있는데 유효한 문자가 없거나, 문자 목록도 text도 없는 경우)
+                    if span["char_dicts"] or (not span.get("chars") and span.get("text")):
+                        spans.append(span)
+    return spans
+
+
+# span 공간 색인의 y 구간 높이 (pt)
+_SPAN_BIN_HEIGHT = 10.0
+
+
+def _build_span_index(spans: List[Dict], page_rect: fitz.Rect) -> Dict[int, List[int]]:
+    """
+    span을 y 구간 격자에 등록 (구간 번호 -> span 인덱스 목록)
+    
+    여러 구간에 걸친 span은 걸친 구간마다 등록한다.
+    페이지 밖으로 벗어난 좌표는 페이지 경계 구간으로 모아 구간 수가 폭증하지 않게 한다.
+    """
+    min_bin = int(page_rect.y0 // _SPAN_BIN_HEIGHT) - 1
+    max_bin = int(page_rect.y1 // _SPAN_BIN_HEIGHT) + 1
+    
+    index = {}
+    for i, span in enumerate(spans):
+        span_bbox = span["bbox"]
+        lo = min(max(int(span_bbox[1] // _SPAN_BIN_HEIGHT), min_bin), max_bin)
+        hi = min(max(int(span_bbox[3] // _SPAN_BIN_HEIGHT), min_bin), max_bin)
+        for b in range(lo, hi + 1):
+            index.setdefault(b, []).append(i)
+    return index
+
+
+def _query_span_index(
+    spans: List[Dict],
+    index: Dict[int, List[int]],
+    y0: float,
+    y1: float,
+    memo: Optional[Dict[Tuple[int, int], List[Dict]]] = None
+) -> List[Dict]:
+    """
+    y 범위와 같은 구간에 있는 span 후보를 원래 순서대로 반환
+    
+    memo를 넘기면 같은 구간 범위의 후보 목록을 재사용한다
+    (같은 줄에 나란히 놓인 블록들은 대개 같은 구간 범위를 조회함).
+    """
+    if not index:
+        return []
+    key = (int(y0 // _SPAN_BIN_HEIGHT), int(y1 // _SPAN_BIN_HEIGHT))
+    if memo is not None and key in memo:
+        return memo[key]
+    
+    # 색인에 있는 구간 범위로 제한 (페이지 밖 좌표도 경계 구간에서 만남)
+    lo = max(key[0], min(index))
+    hi = min(key[1], max(index))
+    
+    hits = set()
+    for b in range(lo, hi + 1):
+        hits.update(index.get(b, ()))
+    # 문자 순서가 줄 구성 결과에 영향을 주므로 페이지 추출 순서를 유지
+    candidates = [spans[i] for i in sorted(hits)]
+    if memo is not None:
+        memo[key] = candidates
+    return candidates
+
+
+def _get_page_spans(
+    pdf_path: Path,
+    page_index: int
+) -> Optional[Tuple[List[Dict], Dict[int, List[int]]]]:
+    """
+    페이지 span 목록과 y 구간 색인 반환 (페이지가 없으면 None)
+    
+    문서 캐시 항목에 함께 보관하여 같은 페이지를 다시 조회할 때 재추출하지 않는다.
+    """
+    with _FITZ_LOCK:
+        entry = _get_doc_entry(pdf_path)
+        page_spans = entry["pages"].get(page_index)
+        if page_spans is not None:
+            return page_spans
+        # 페이지 단위 PDF라 범위를 벗어나는 일은 드물므로 길이 확인 대신 IndexError로 처리
+        try:
+            page = entry["doc"][page_index]
+        except IndexError:
+            return None
+        spans = _collect_page_spans(page)
+        logger.debug(f"페이지 span 추출: {pdf_path.name} p{page_index} ({len(spans)}개 span)")
+        page_spans = (spans, _build_span_index(spans, page.rect))
+        entry["pages"][page_index] = page_spans
+    return page_spans
+
+
+def _group_chars_into_lines(chars: List[Dict]) -> List[List[Dict]]:
+    """
+    문자들을 y 좌표 기준으로 줄 단위로 묶어 위에서 아래 순서로 반환 (각 줄은 x0 순 정렬)
+    """
+    # 줄 정보는 평행 리스트로 관리하여 줄 찾기 루프가 평균 y 목록만 훑도록 함 (dict 조회 없음)
+    line_tolerance = 3.0
+    if not chars:
+        return []
+    
+    # 흔한 한 줄짜리 영역(제목/머리글 등): y0 폭이 허용 오차보다 작으면
+    # 누적 평균도 같은 범위 안에 있으므로 모든 문자가 첫 줄에 묶임 -> 줄 찾기 루프 생략
+    ys = [c["y0"] for c in chars]
+    if max(ys) - min(ys) < line_tolerance:
+        return [sorted(chars, key=_CHAR_X0)]
+    
+    line_avgs = []
+    line_sums = []
+    line_counts = []
+    line_members = []
+    for char in chars:
+        y0 = char["y0"]
+        for li, line_avg_y in enumerate(line_avgs):
+            if abs(line_avg_y - y0) <= line_tolerance:
+                line_members[li].append(char)
+                # 평균 y를 누적합으로 갱신 (매번 전체 합을 다시 구하지 않음)
+                line_sums[li] += y0
+                line_counts[li] += 1
+                line_avgs[li] = line_sums[li] / line_counts[li]
+                break
+        else:
+            line_avgs.append(y0)
+            line_sums.append(y0)
+            line_counts.append(1)
+            line_members.append([char])
+    
+    for members in line_members:
+        members.sort(key=_CHAR_X0)
+    # 평균 y 순으로 정렬 (안정 정렬이므로 평균이 같으면 생성 순서 유지)
+    line_order = sorted(range(len(line_avgs)), key=line_avgs.__getitem__)
+    return [line_members[li] for li in line_order]
+
+
+def _join_line_chars(line_chars: List[Dict]) -> str:
+    """
+    한 줄의 문자들을 간격/문자 유형 규칙에 따라 띄어쓰기를 넣어 이어 붙임
+    """
+    # 문자 유형은 글자마다 한 번만 구해 이웃 쌍 비교에 재사용
+    char_types = [_get_char_type(c["char"]) for c in line_chars]
+    
+    line_parts = [line_chars[0]["char"]]
+    for i in range(1, len(line_chars)):
+        char = line_chars[i - 1]
+        next_char = line_chars[i]
         
-        doc.close()
+        gap = next_char["x0"] - char["x1"]
+        estimated_gap = char.get("estimated_next_gap", 0)
+        if estimated_gap > 0:
+            gap = max(gap, estimated_gap)
         
-        font_sizes = []
-        bold_flags = []
-        font_names = []
-        chars = []
+        char_height = char["y1"] - char["y0"]
+        # 가로 경계가 같은 span의 문자는 같은 span으로 취급 (정수 번호 비교 한 번)
+        same_span = char["span_id"] == next_char["span_id"]
         
-        for block in text_dict.get("blocks", []):
-            if "lines" not in block:
-                continue
-            for line in block.get("lines", []):
-                for span in line.get("spans", []):
-                    span_size = span.get("size", None)
-                    span_flags = span.get("flags", 0)
-                    span_font = span.get("font", None)
-                    
-                    if span_size is not None:
-                        font_sizes.append(span_size)
-                    is_span_bold = bool(span_flags & 16) if span_flags else False
-                    bold_flags.append(is_span_bold)
-                    if span_font:
-                        font_names.append(span_font)
-                    
-                    span_chars = span.get("chars", [])
-                    
-                    if span_chars:
-                        for char_info in span_chars:
-                            char_text = char_info.get("c", "")
-                            char_bbox = char_info.get("bbox", [0, 0, 0, 0])
-                            
-                            if len(char_bbox) >= 4 and char_text:
-                                chars.append({
-                                    "char": char_text,
-                                    "x0": char_bbox[0],
-                                    "y0": char_bbox[1],
-                                    "x1": char_bbox[2],
-                                    "y1": char_bbox[3],
-                                    "center_x": (char_bbox[0] + char_bbox[2]) / 2,
-                                    "center_y": (char_bbox[1] + char_bbox[3]) / 2,
-                                    "span_origin": span.get("bbox", [0, 0, 0, 0])[0] if len(span.get("bbox", [])) >= 1 else 0,
-                                    "span_end": span.get("bbox", [0, 0, 0, 0])[2] if len(span.get("bbox", [])) >= 3 else 0
-                                })
-                    else:
-                        text = span.get("text", "")
-                        bbox = span.get("bbox", [0, 0, 0, 0])
-                        if len(bbox) < 4 or not text:
-                            continue
-                        
-                        span_x0, span_y0, span_x1, span_y1 = bbox[0], bbox[1], bbox[2], bbox[3]
-                        span_width = span_x1 - span_x0
-                        char_width = span_width / len(text) if len(text) > 0 else 0
-                        
-                        for i, char in enumerate(text):
-                            char_x0 = span_x0 + (i * char_width)
-                            char_x1 = span_x0 + ((i + 1) * char_width)
-                            
-                            chars.append({
-                                "char": char,
-                                "x0": char_x0,
-                                "y0": span_y0,
-                                "x1": char_x1,
-                                "y1": span_y1,
-                                "center_x": (char_x0 + char_x1) / 2,
-                                "center_y": (span_y0 + span_y1) / 2,
-                                "span_origin": span_x0,
-                                "span_end": span_x1
-                            })
-        
-        if not chars:
-            return {"text": "", "text_length": 0, "font_size": None, "is_bold": None, "font_name": None}
-        
-        chars = _remove_duplicate_chars(chars)
+        if same_span:
+            if estimated_gap > 0:
+                gap_threshold = max(1.5, char_height * 0.2)
+            else:
+                # 단어 경계 판정은 같은 span 안에서만 쓰이므로 이 경우에만 계산
+                char_type = char_types[i - 1]
+                next_char_type = char_types[i]
+                
+                is_word_boundary = False
+                if char_type == "korean" and next_char_type == "korean":
+                    if gap > char_height * 0.4:
+                        is_word_boundary = True
+                elif char_type in ["korean", "hanja"] and next_char_type in ["korean", "hanja"]:
+                    if gap > char_height * 0.35:
+                        is_word_boundary = True
+                
+                if is_word_boundary:
+                    gap_threshold = max(2.0, char_height * 0.25)
+                else:
+                    gap_threshold = max(2.0, char_height * 0.4)
+        else:
+            gap_threshold = max(1.5, char_height * 0.2)
         
-        line_tolerance = 3.0
-        lines = []
-        for char in chars:
-            y0 = char["y0"]
-            found_line = False
-            for line in lines:
-                line_avg_y = line["avg_y"]
-                if abs(line_avg_y - y0) <= line_tolerance:
-                    line["chars"].append(char)
-                    line["avg_y"] = sum(c["y0"] for c in line["chars"]) / len(line["chars"])
-                    found_line = True
-                    break
-            
-            if not found_line:
-                lines.append({"avg_y": y0, "chars": [char]})
+        if gap > gap_threshold:
+            line_parts.append(" ")
+        line_parts.append(next_char["char"])
+    
+    return "".join(line_parts)
+
+
+def _build_text_from_chars(chars: List[Dict]) -> str:
+    """
+    문자 목록으로부터 최종 텍스트 생성 (중복 제거 -> 줄 구성 -> 띄어쓰기 -> 후처리)
+    """
+    chars = _remove_duplicate_chars(chars)
+    line_texts = [_join_line_chars(line_chars) for line_chars in _group_chars_into_lines(chars) if line_chars]
+    return _normalize_spaces_and_punct(" ".join(line_texts))
+
+
+def _extract_text_with_font_info_from_spans(
+    spans: List[Dict],
+    pdf_bbox: List[float]
+) -> Dict[str, Any]:
+    """
+    페이지 span 목록에서 중심점이 지정된 bbox 영역 안에 있는 문자만 골라 텍스트와 폰트 정보를 추출
+    
+    bbox 경계에 살짝 걸친 옆 줄/옆 칸 글자가 섞이지 않도록 겹침이 아닌 중심점으로 판정한다.
+    """
+    x1, y1, x2, y2 = pdf_bbox
+    
+    font_sizes = []
+    # 굵기 판정은 다수결만 필요하므로 span별 목록 대신 개수만 셈
+    bold_count = 0
+    span_count = 0
+    font_names = []
+    chars = []
+    
+    for span in spans:
+        span_bbox = span["bbox"]
+        span_x0, span_y0, span_x1, span_y1 = span_bbox[0], span_bbox[1], span_bbox[2], span_bbox[3]
+        # 영역과 겹치지 않는 span은 문자 단위 비교 없이 건너뜀
+        if span_x0 >= x2 or span_x1 <= x1 or span_y0 >= y2 or span_y1 <= y1:
+            continue
         
-        for line in lines:
-            line["chars"].sort(key=lambda c: c["x0"])
-        lines.sort(key=lambda line: line["avg_y"])
+        span_hits = []
         
-        line_texts = []
-        for line in lines:
-            line_chars = line["chars"]
-            if not line_chars:
+        if span.get("chars"):
+            extent = span["char_extent"]
+            if extent is not None and x1 < extent[0] and extent[2] < x2 and y1 < extent[1] and extent[3] < y2:
+                # 모든 문자가 영역 안에 있으므로 문자별 검사 생략
+                span_hits = span["char_dicts"]
+            else:
+                for center_x, center_y, char in span["char_centers"]:
+                    if x1 <= center_x <= x2 and y1 <= center_y <= y2:
+                        span_hits.append(char)
+        else:
+            text = span.get("text", "")
+            if not text:
+                continue
+            # 문자 좌표가 없으면 span 높이를 그대로 쓰므로 세로 판정은 span 중심으로 함
+            if not y1 <= (span_y0 + span_y1) / 2 <= y2:
                 continue
             
-            line_parts = []
-            for i, char in enumerate(line_chars):
-                line_parts.append(char["char"])
-                
-                if i < len(line_chars) - 1:
-                    next_char = line_chars[i + 1]
-                    gap = next_char["x0"] - char["x1"]
-                    estimated_gap = char.get("estimated_next_gap", 0)
-                    if estimated_gap > 0:
-                        gap = max(gap, estimated_gap)
-                    
-                    char_height = char["y1"] - char["y0"]
-                    same_span = (char.get("span_origin") == next_char.get("span_origin") and
-                                char.get("span_end") == next_char.get("span_end"))
-                    
-                    char_type = _get_char_type(char["char"])
-                    next_char_type = _get_char_type(next_char["char"])
-                    
-                    is_word_boundary = False
-                    if char_type == "korean" and next_char_type == "korean":
-                        if gap > char_height * 0.4:
-                            is_word_boundary = True
-                    elif char_type in ["korean", "hanja"] and next_char_type in ["korean", "hanja"]:
-                        if gap > char_height * 0.35:
-                            is_word_boundary = True
-                    
-                    if same_span:
-                        if estimated_gap > 0:
-                            gap_threshold = max(1.5, char_height * 0.2)
-                        elif is_word_boundary:
-                            gap_threshold = max(2.0, char_height * 0.25)
-                        else:
-                            gap_threshold = max(2.0, char_height * 0.4)
-                    else:
-                        gap_threshold = max(1.5, char_height * 0.2)
-                    
-                    if gap > gap_threshold:
-                        line_parts.append(" ")
+            span_width = span_x1 - span_x0
+            char_width = span_width / len(text) if len(text) > 0 else 0
+            span_id = span["span_id"]
             
-            line_text = "".join(line_parts)
-            line_texts.append(line_text)
+            for i, char in enumerate(text):
+                char_x0 = span_x0 + (i * char_width)
+                char_x1 = span_x0 + ((i + 1) * char_width)
+                if not x1 <= (char_x0 + char_x1) / 2 <= x2:
+                    continue
+                
+                span_hits.append({
+                    "char": char,
+                    "x0": char_x0,
+                    "y0": span_y0,
+                    "x1": char_x1,
+                    "y1": span_y1,
+                    "span_id": span_id
+                })
         
-        text = " ".join(line_texts)
-        text = _apply_punctuation_rules(text)
-        text = text.replace('\n', ' ').strip()
-        text = text.replace('\\"', '')
-        text = re.sub(r'\s+', ' ', text)
+        # 영역 안에 문자가 하나도 없는 span은 폰트 통계에서도 제외
+        if not span_hits:
+            continue
+        chars.extend(span_hits)
         
-        avg_font_size = sum(font_sizes) / len(font_sizes) if font_sizes else None
-        is_bold = True if bold_flags and sum(bold_flags) > len(bold_flags) * 0.5 else False if bold_flags else None
-        font_name = max(set(font_names), key=font_names.count) if font_names else None
-        text_length = len(text)
+        span_size = span.get("size", None)
+        span_flags = span.get("flags", 0)
+        span_font = span.get("font", None)
         
-        return {
-            "text": text,
-            "text_length": text_length,
-            "font_size": round(avg_font_size, 2) if avg_font_size else None,
-            "is_bold": is_bold,
-            "font_name": font_name
-        }
-    except Exception as e:
-        logger.error(f"텍스트 추출 실패 ({pdf_path}, page {page_index}): {e}", exc_info=True)
-        return {"text": "", "text_length": 0, "font_size": None, "is_bold": None, "font_name": None}
+        if span_size is not None:
+            font_sizes.append(span_size)
+        span_count += 1
+        if span_flags and span_flags & 16:
+            bold_count += 1
+        if span_font:
+            font_names.append(span_font)
+    
+    if not chars:
+        return _empty_text_info()
+    
+    text = _build_text_from_chars(chars)
+    
+    avg_font_size = sum(font_sizes) / len(font_sizes) if font_sizes else None
+    is_bold = bold_count * 2 > span_count if span_count else None
+    # 최빈 폰트명을 한 번의 집계로 구함 (동률이면 먼저 나온 폰트)
+    font_name = Counter(font_names).most_common(1)[0][0] if font_names else None
+    text_length = len(text)
+    
+    return {
+        "text": text,
+        "text_length": text_length,
+        "font_size": round(avg_font_size, 2) if avg_font_size else None,
+        "is_bold": is_bold,
+        "font_name": font_name
+    }
+
+
+def extract_text_with_font_info_from_pdf_bbox(
+    pdf_path: Path, 
+    pdf_bbox: List[float], 
+    page_index: int = 0
+) -> Dict[str, Any]:
+    """
+    PDF에서 지정된 bbox 영역의 텍스트와 폰트 정보를 추출
+    """
+    return extract_texts_with_font_info_from_pdf_bboxes(pdf_path, [pdf_bbox], page_index)[0]
 
 
 def extract_texts_with_font_info_from_pdf_bboxes(
@@ -518,22 +850,37 @@ def extract_texts_with_font_info_from_pdf_bboxes(
     pdf_bboxes: List[List[float]],
     page_index: int = 0
 ) -> List[Dict[str, Any]]:
-    """PDF에서 여러 bbox 영역의 텍스트와 폰트 정보를 한번에 추출"""
+    """PDF에서 여러 bbox 영역의 텍스트와 폰트 정보를 한번에 추출 (문서는 한 번만 연다)"""
     if not pdf_bboxes:
         return []
     
     try:
-        results = []
-        for pdf_bbox in pdf_bboxes:
-            if len(pdf_bbox) != 4:
-                results.append({"text": "", "text_length": 0, "font_size": None, "is_bold": None, "font_name": None})
-                continue
-            result = extract_text_with_font_info_from_pdf_bbox(pdf_path, pdf_bbox, page_index)
-            results.append(result)
-        return results
+        page_spans = _get_page_spans(pdf_path, page_index)
+        if page_spans is None:
+            return [_empty_text_info() for _ in pdf_bboxes]
+        spans, span_index = page_spans
     except Exception as e:
         logger.error(f"텍스트 추출 실패 ({pdf_path}, page {page_index}): {e}", exc_info=True)
-        return [{"text": "", "text_length": 0, "font_size": None, "is_bold": None, "font_name": None}] * len(pdf_bboxes)
+        return [_empty_text_info() for _ in pdf_bboxes]
+    
+    results = []
+    candidates_memo = {}
+    for pdf_bbox in pdf_bboxes:
+        if len(pdf_bbox) != 4:
+            results.append(_empty_text_info())
+            continue
+        try:
+            # 면적이 없거나 뒤집힌 영역은 겹치는 문자가 있을 수 없으므로 조회 생략
+            if pdf_bbox[2] <= pdf_bbox[0] or pdf_bbox[3] <= pdf_bbox[1]:
+                results.append(_empty_text_info())
+                continue
+            # y 구간 색인으로 겹칠 수 있는 span만 골라 비교
+            candidates = _query_span_index(spans, span_index, pdf_bbox[1], pdf_bbox[3], candidates_memo)
+            results.append(_extract_text_with_font_info_from_spans(candidates, pdf_bbox))
+        except Exception as e:
+            logger.error(f"텍스트 추출 실패 ({pdf_path}, page {page_index}): {e}", exc_info=True)
+            results.append(_empty_text_info())
+    return results
 
 
 # =============================================================================
@@ -573,7 +920,6 @@ def detect_and_relabel_formula_blocks(parsing_res_list: List[Dict]) -> int:
     Returns:
         재라벨링된 블록 수
     """
-    text_block_labels = ["doc_title", "paragraph_title", "text", "figure_title", "header", 'vision_footnote']
     relabeled_count = 0
     
     for block in parsing_res_list:
@@ -582,7 +928,7 @@ def detect_and_relabel_formula_blocks(parsing_res_list: List[Dict]) -> int:
         
         # 텍스트 블록이고, private glyph가 포함되어 있으면 formula로 변경
         # (이미 formula인 블록은 변경하지 않음)
-        if block_label in text_block_labels and has_private_glyphs(block_content):
+        if block_label in _TEXT_BLOCK_LABELS and has_private_glyphs(block_content):
             logger.debug(f"블록 라벨 변경: {block_label} -> formula (block_id={block.get('block_id')}, "
                         f"content_preview={block_content[:50]}...)")
             block["block_label"] = "formula"
@@ -594,6 +940,22 @@ def detect_and_relabel_formula_blocks(parsing_res_list: List[Dict]) -> int:
     return relabeled_count
 
 
+# =============================================================================
+# JSON 입출력
+# =============================================================================
+
+def _wait_pending_writes(pending: List[Tuple[Path, Future]]) -> List[Path]:
+    """대기 중인 비동기 쓰기를 모두 완료시키고 실패한 파일 목록 반환"""
+    failed_files = []
+    for output_file, future in pending:
+        try:
+            future.result()
+        except Exception as e:
+            logger.error(f"JSON 파일 저장 실패 ({output_file.name}): {e}", exc_info=True)
+            failed_files.append(output_file)
+    return failed_files
+
+
 # =============================================================================
 # 메인 처리 함수 (박스 감지 추가)
 # =============================================================================
@@ -612,8 +974,7 @@ def process_text_blocks_in_json(
     Returns:
         업데이트된 데이터 딕셔너리
     """
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(json_path)
     
     page_index = data.get("page_index", 0)
     parsing_res_list = data.get("parsing_res_list", [])
@@ -630,13 +991,14 @@ def process_text_blocks_in_json(
     # =========================================================================
     boxes = []
     try:
-        doc = fitz.open(str(pdf_path))
-        if len(doc) > 0:
-            page = doc[0]
-            # 개선된 박스 감지 방식 사용
-            boxes = extract_boxes_from_page_improved(page, min_width=100, min_height=50)
-            logger.info(f"페이지 {page_index}: {len(boxes)}개 박스 감지")
-        doc.close()
+        # 텍스트 추출과 같은 캐시 문서를 사용 (페이지 파일을 한 번만 연다)
+        with _FITZ_LOCK:
+            doc = _get_cached_doc(pdf_path)
+            if len(doc) > 0:
+                page = doc[0]
+                # 개선된 박스 감지 방식 사용
+                boxes = extract_boxes_from_page_improved(page, min_width=100, min_height=50)
+                logger.info(f"페이지 {page_index}: {len(boxes)}개 박스 감지")
     except Exception as e:
         logger.warning(f"박스 추출 실패 ({pdf_path}): {e}")
     
@@ -646,14 +1008,12 @@ def process_text_blocks_in_json(
     # =========================================================================
     # 2. 텍스트 블록 처리
     # =========================================================================
-    text_block_labels = ["doc_title", "paragraph_title", "text", "figure_title", "header", 'vision_footnote']
-    
     text_block_indices = []
     text_block_bboxes = []
     
     for idx, block in enumerate(parsing_res_list):
         block_label = block.get("block_label", "")
-        if block_label in text_block_labels:
+        if block_label in _TEXT_BLOCK_LABELS:
             pdf_bbox = block.get("pdf_bbox", [])
             if pdf_bbox and len(pdf_bbox) == 4:
                 text_block_indices.append(idx)
@@ -664,14 +1024,17 @@ def process_text_blocks_in_json(
         text_font_infos = extract_texts_with_font_info_from_pdf_bboxes(pdf_path, text_block_bboxes, page_index=0)
         
         for idx, info in zip(text_block_indices, text_font_infos):
-            parsing_res_list[idx]["block_content"] = info.get("text", "")
-            parsing_res_list[idx]["text_length"] = info.get("text_length", 0)
-            if info.get("font_size") is not None:
-                parsing_res_list[idx]["font_size"] = info["font_size"]
-            if info.get("is_bold") is not None:
-                parsing_res_list[idx]["is_bold"] = info["is_bold"]
+            payload = {
+                "block_content": info.get("text", ""),
+                "text_length": info.get("text_length", 0)
+            }
+            for key in ("font_size", "is_bold"):
+                value = info.get(key)
+                if value is not None:
+                    payload[key] = value
             if info.get("font_name"):
-                parsing_res_list[idx]["font_name"] = info["font_name"]
+                payload["font_name"] = info["font_name"]
+            parsing_res_list[idx].update(payload)
     
     # =========================================================================
     # 2.5. Private glyph가 포함된 텍스트 블록을 formula로 재라벨링
@@ -702,9 +1065,16 @@ def process_text_blocks_in_json(
 def _process_single_json_file(
     json_file: Path,
     pdf_pages_dir: Path,
-    output_dir: Path = None
-) -> tuple[Path, bool]:
-    """단일 JSON 파일 처리 (병렬 처리용)"""
+    output_dir: Path = None,
+    io_pool: Optional[Executor] = None,
+    pretty: bool = False
+) -> Tuple[Path, bool, Optional[Future]]:
+    """
+    단일 JSON 파일 처리 (병렬 처리용)
+    
+    io_pool을 넘기면 직렬화한 결과의 파일 쓰기를 그 풀에 맡기고 바로 반환하므로
+    호출 측에서 반환된 Future로 완료를 확인해야 함 (프로세스 워커에서는 None)
+    """
     worker_logger = logging.getLogger(f"{__name__}.worker")
     
     try:
@@ -717,64 +1087,172 @@ def _process_single_json_file(
         else:
             output_file = json_file
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(updated_data, f, ensure_ascii=False, indent=2)
+        write_future = None
+        if io_pool is not None:
+            write_future = io_pool.submit(atomic_write, output_file, serialize_json(updated_data, pretty))
+        else:
+            dump_json(updated_data, output_file, pretty)
         
         worker_logger.debug(f"JSON 파일 처리 완료: {output_file.name}")
-        return output_file, True
+        return output_file, True, write_future
     except Exception as e:
         worker_logger.error(f"JSON 파일 처리 실패 ({json_file.name}): {e}", exc_info=True)
-        return json_file, False
+        return json_file, False, None
+
+
+def _process_json_file_chunk(
+    json_files: List[Path],
+    pdf_pages_dir: Path,
+    output_dir: Path = None,
+    io_pool: Optional[Executor] = None,
+    pretty: bool = False
+) -> List[Tuple[Path, bool, Optional[Future]]]:
+    """연속된 JSON 파일 묶음을 한 작업으로 처리 (프로세스 풀 IPC 횟수를 줄이기 위함)"""
+    return [
+        _process_single_json_file(json_file, pdf_pages_dir, output_dir, io_pool, pretty)
+        for json_file in json_files
+    ]
+
+
+def _iter_completed_futures(futures: List[Future]):
+    """완료된 순서대로 future를 내보내며 진행 상황 로그 기록"""
+    total = len(futures)
+    for done, future in enumerate(as_completed(futures), 1):
+        logger.info(f"텍스트 추출 진행: {done}/{total}")
+        yield future
+
+
+def _list_result_json_files(parsing_results_dir: Path) -> List[Path]:
+    """*_res.json 파일 목록을 이름순으로 반환 (scandir로 한 번만 훑고 일치하는 항목만 Path로 만듦)"""
+    if not parsing_results_dir.is_dir():
+        return []
+    with os.scandir(parsing_results_dir) as it:
+        names = [e.name for e in it if e.name.endswith("_res.json") and e.is_file()]
+    names.sort()
+    return [parsing_results_dir / name for name in names]
 
 
 def process_all_json_files(
     parsing_results_dir: Path,
     pdf_pages_dir: Path,
     output_dir: Path = None,
-    max_workers: int = 10
+    max_workers: Optional[int] = 10,
+    executor: Union[str, Executor] = "process",
+    pretty: bool = False,
+    progress_reporting: bool = False
 ) -> List[Path]:
-    """parsing_results 디렉토리의 모든 JSON 파일을 처리 (병렬 처리 지원)"""
-    json_files = sorted(parsing_results_dir.glob("*_res.json"))
+    """
+    parsing_results 디렉토리의 모든 JSON 파일을 처리 (병렬 처리 지원)
+    
+    Args:
+        parsing_results_dir: 레이아웃 파싱 결과 JSON 파일들이 있는 디렉토리
+        pdf_pages_dir: PDF 분할 파일들이 있는 디렉토리
+        output_dir: JSON 출력 디렉토리 (None이면 원본 파일 덮어쓰기)
+        max_workers: 병렬 처리 워커 수 (None 또는 0이면 CPU 코어 수, 파일 수를 넘지 않음)
+        executor: 병렬 처리 방식 ("process": 프로세스 풀, "thread": 스레드 풀)
+            스레드 풀은 fork/pickling 비용이 없지만 PyMuPDF 호출(문서 열기, 페이지
+            추출, 박스 감지)이 _FITZ_LOCK으로 직렬화되어 bbox 조립과 파일 쓰기만
+            겹쳐 실행되므로 기본값은 "process"
+            이미 만들어 둔 Executor를 넘기면 새 풀을 만들지 않고 그대로 사용하며
+            종료도 하지 않음 (파이프라인 전체에서 풀 하나를 재사용할 때)
+        pretty: True이면 들여쓰기 2칸으로 저장 (기본은 compact,
+            DOCLAYOUT_DEBUG 환경 변수로도 켤 수 있음)
+        progress_reporting: True이면 파일 단위로 제출하고 완료될 때마다 진행 상황을 로그로 남김
+            (기본은 묶음 단위 map으로 순서대로 결과 수집)
+    
+    Returns:
+        처리된 JSON 파일 경로 리스트
+    """
+    external_pool = isinstance(executor, Executor)
+    if not external_pool and executor not in ("process", "thread"):
+        raise ValueError(f"지원하지 않는 executor: {executor} (process 또는 thread)")
+    
+    json_files = _list_result_json_files(parsing_results_dir)
     
     if not json_files:
         logger.warning(f"JSON 파일을 찾을 수 없습니다: {parsing_results_dir}")
         return []
     
+    pretty = pretty or is_pretty_json_enabled()
+    
+    # 파일 수나 CPU 수보다 많은 워커는 띄워도 놀기만 하므로 둘 중 작은 값으로 제한
+    cpu_count = os.cpu_count() or 1
+    requested_workers = max_workers or cpu_count
+    max_workers = max(1, min(requested_workers, len(json_files), cpu_count))
+    
     logger.info(f"텍스트 추출 시작: {len(json_files)}개 JSON 파일")
-    logger.info(f"병렬 처리 워커 수: {max_workers}")
+    if external_pool:
+        logger.info(f"병렬 처리: 외부 executor 사용 ({type(executor).__name__})")
+    else:
+        logger.info(
+            f"병렬 처리 워커 수: {max_workers} ({executor}, "
+            f"요청 {requested_workers}, 파일 {len(json_files)}, CPU {cpu_count})"
+        )
     
     processed_files = []
+    pending_writes: List[Tuple[Path, Future]] = []
+    use_pool = len(json_files) > 1 and (external_pool or max_workers > 1)
+    # 프로세스 워커의 쓰기는 부모에서 기다릴 수 없으므로 스레드 풀과 순차 처리에서만 비동기 쓰기 사용
+    write_async = not use_pool or executor == "thread" or isinstance(executor, ThreadPoolExecutor)
     
-    if max_workers > 1 and len(json_files) > 1:
-        futures = []
-        with ProcessPoolExecutor(max_workers=max_workers) as ex:
+    # 디스크 쓰기를 다음 파일의 PDF 파싱과 겹치게 하는 writer 스레드 (호출이 끝나면 함께 종료)
+    with (ThreadPoolExecutor(max_workers=1) if write_async else nullcontext()) as io_pool:
+        if use_pool:
+            if external_pool:
+                # 호출자가 관리하는 풀이므로 with 블록이 끝나도 종료하지 않음
+                pool = nullcontext(executor)
+            elif executor == "thread":
+                pool = ThreadPoolExecutor(max_workers=max_workers)
+            else:
+                # 가능하면 forkserver로 띄워 부모의 스레드/잠금 상태를 물려받지 않도록 함
+                mp_context = None
+                if "forkserver" in multiprocessing.get_all_start_methods():
+                    mp_context = multiprocessing.get_context("forkserver")
+                pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context)
+            # 페이지 순으로 정렬된 파일을 연속 묶음으로 나눠 보내 IPC 횟수를 줄임
+            # (진행 상황 기록 시에는 파일 단위로 보내 완료될 때마다 기록, 파일마다 IPC 왕복이 생김)
+            chunksize = 1 if progress_reporting else max(1, len(json_files) // (max_workers * 4))
+            chunks = [json_files[i:i + chunksize] for i in range(0, len(json_files), chunksize)]
+            with pool as ex:
+                futures = {
+                    ex.submit(_process_json_file_chunk, chunk, pdf_pages_dir, output_dir, io_pool, pretty): chunk
+                    for chunk in chunks
+                }
+                completed = _iter_completed_futures(list(futures)) if progress_reporting else futures
+                for future in completed:
+                    # 묶음 하나가 실패해도 (워커 비정상 종료 등) 나머지 묶음의 결과는 계속 수집
+                    try:
+                        chunk_results = future.result()
+                    except Exception as e:
+                        failed_names = ", ".join(f.name for f in futures[future])
+                        logger.error(f"처리 중 오류 ({failed_names}): {e}", exc_info=True)
+                        continue
+                    for output_file, success, write_future in chunk_results:
+                        if success:
+                            processed_files.append(output_file)
+                            if write_future is not None:
+                                pending_writes.append((output_file, write_future))
+                            logger.debug(f"처리 완료: {output_file.name}")
+                        else:
+                            logger.warning(f"처리 실패: {output_file.name}")
+            # 완료 순서로 모인 결과를 파일 순서로 되돌림
+            if progress_reporting:
+                processed_files.sort()
+        else:
             for json_file in json_files:
-                futures.append(ex.submit(
-                    _process_single_json_file,
-                    json_file,
-                    pdf_pages_dir,
-                    output_dir
-                ))
-            
-            for future in as_completed(futures):
-                try:
-                    output_file, success = future.result()
-                    if success:
-                        processed_files.append(output_file)
-                        logger.debug(f"처리 완료: {output_file.name}")
-                    else:
-                        logger.warning(f"처리 실패: {output_file.name}")
-                except Exception as e:
-                    logger.error(f"처리 중 오류: {e}", exc_info=True)
-    else:
-        for json_file in json_files:
-            logger.debug(f"처리 중: {json_file.name}")
-            output_file, success = _process_single_json_file(
-                json_file, pdf_pages_dir, output_dir
-            )
-            if success:
-                processed_files.append(output_file)
-                logger.debug(f"저장 완료: {output_file.name}")
+                logger.debug(f"처리 중: {json_file.name}")
+                output_file, success, write_future = _process_single_json_file(
+                    json_file, pdf_pages_dir, output_dir, io_pool=io_pool, pretty=pretty
+                )
+                if success:
+                    processed_files.append(output_file)
+                    pending_writes.append((output_file, write_future))
+                    logger.debug(f"저장 완료: {output_file.name}")
+        
+        failed_writes = _wait_pending_writes(pending_writes)
+    
+    if failed_writes:
+        processed_files = [f for f in processed_files if f not in failed_writes]
     
     logger.info(f"텍스트 추출 완료: {len(processed_files)}개 파일 처리")
     
@@ -787,23 +1265,55 @@ def process_all_json_files(
 
 def test_box_detection(pdf_path: Path, page_index: int = 0):
     """박스 감지 테스트"""
-    doc = fitz.open(str(pdf_path))
-    if page_index >= len(doc):
-        print(f"페이지 {page_index}가 없습니다.")
-        doc.close()
-        return
-    
-    page = doc[page_index]
-    boxes = extract_boxes_from_page(page, min_width=100, min_height=50)
+    with fitz.open(str(pdf_path)) as doc:
+        if page_index >= len(doc):
+            print(f"페이지 {page_index}가 없습니다.")
+            return
+        
+        page = doc[page_index]
+        boxes = extract_boxes_from_page(page, min_width=100, min_height=50)
     
     print(f"=== 페이지 {page_index}: {len(boxes)}개 박스 감지 ===")
     for box in boxes:
         print(f"  Box {box['id']}: {box['rect']} (type: {box['type']}, size: {box['width']:.1f}x{box['height']:.1f})")
     
-    doc.close()
     return boxes
 
 
+def test_clip_consistency(json_path: Path, pdf_pages_dir: Path) -> List[List[float]]:
+    """
+    페이지 1회 추출 결과와 bbox별 get_text(clip=...) 결과의 텍스트 비교 (회귀 확인용)
+    
+    clip 결과에도 같은 중심점 판정을 적용하므로, 차이가 나면 span 색인이나
+    후보 선택 단계에서 문자가 빠지거나 잘못 들어온 것이다.
+    (clip은 span을 다시 나누므로 폰트 크기 평균은 달라질 수 있어 비교하지 않음)
+    
+    Returns:
+        결과가 다른 bbox 목록
+    """
+    data = load_json(json_path)
+    page_index = data.get("page_index", 0)
+    pdf_path = pdf_pages_dir / f"page_{page_index+1:04d}.pdf"
+    bboxes = [
+        block["pdf_bbox"] for block in data.get("parsing_res_list", [])
+        if block.get("block_label", "") in _TEXT_BLOCK_LABELS and len(block.get("pdf_bbox") or []) == 4
+    ]
+    
+    current = extract_texts_with_font_info_from_pdf_bboxes(pdf_path, bboxes, page_index=0)
+    mismatched = []
+    with fitz.open(str(pdf_path)) as doc:
+        page = doc[0]
+        for pdf_bbox, info in zip(bboxes, current):
+            clip_dict = page.get_text("rawdict", clip=fitz.Rect(pdf_bbox), flags=_RAWDICT_FLAGS)
+            expected = _extract_text_with_font_info_from_spans(_spans_from_text_dict(clip_dict), pdf_bbox)
+            if info["text"] != expected["text"]:
+                mismatched.append(pdf_bbox)
+                print(f"  불일치 {pdf_bbox}: {info['text'][:40]!r} != {expected['text'][:40]!r}")
+    
+    print(f"=== {json_path.name}: {len(bboxes)}개 bbox 중 {len(mismatched)}개 불일치 ===")
+    return mismatched
+
+
 if __name__ == "__main__":
     # 테스트
     import sys
@@ -1,74 +1,125 @@
 """VLM 처리용 이미지 추출 (table, chart, figure)"""
 import fitz  # PyMuPDF
 from pathlib import Path
-from typing import List, Dict, Optional
-import json
-from PIL import Image
-import io
+from typing import List, Dict, Optional, Union
 import logging
+import os
 import sys
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+from object_parsing.json_io import atomic_write, dump_json, is_pretty_json_enabled, load_json
+
+# 로깅 설정은 실행 진입점(main.py 등)에서 담당
 logger = logging.getLogger(__name__)
 
+# PyMuPDF는 스레드 안전하지 않으므로 PDF 열기/렌더링은 한 번에 한 스레드만 수행
+# (이미지 파일 쓰기와 JSON 저장은 잠금 밖에서 스레드끼리 겹쳐 실행됨)
+_FITZ_LOCK = threading.Lock()
+
+# VLM 처리 대상 블록 라벨
+VLM_BLOCK_LABELS = frozenset({"table", "chart", "figure", "image", "formula"})
+
+# 흑백으로 렌더링해도 되는 블록 라벨 (수식은 색 정보가 없으므로 픽셀당 1바이트로 렌더링)
+GRAYSCALE_BLOCK_LABELS = frozenset({"formula"})
+
+# 렌더링 긴 변 목표 픽셀 수와 zoom 허용 범위
+# table, formula는 VLM 클라이언트가 축소하지 않고 그대로 보내므로 작은 글자 판독을 위해 크게 렌더링
+DEFAULT_TARGET_LONG_SIDE = 1536
+# chart, figure, image는 VLM 클라이언트가 전송 전 긴 변을 qwen3_vl_client.DEFAULT_MAX_IMAGE_SIDE(1280)로
+# 줄이므로 같은 크기로 렌더링하여 저장 직후 한 번 더 리샘플링되지 않게 함
+TARGET_LONG_SIDE_BY_LABEL = {"chart": 1280, "figure": 1280, "image": 1280}
+MIN_ZOOM = 1.0
+MAX_ZOOM = 3.0
+
+
+def _has_visible_area(pdf_bbox: List[float], page_rect: fitz.Rect) -> bool:
+    """bbox가 넓이를 가지고 페이지 영역과 겹치는지 확인 (아니면 렌더링이 실패하므로 미리 건너뜀)"""
+    x1, y1, x2, y2 = pdf_bbox
+    return (
+        x1 < x2 and y1 < y2
+        and x1 < page_rect.x1 and x2 > page_rect.x0
+        and y1 < page_rect.y1 and y2 > page_rect.y0
+    )
+
+
+def _adaptive_zoom(pdf_bbox: List[float], target_long_side: int = DEFAULT_TARGET_LONG_SIDE) -> float:
+    """bbox 긴 변이 target_long_side 픽셀을 넘지 않도록 zoom 계산 (MIN_ZOOM~MAX_ZOOM 범위로 제한)"""
+    x1, y1, x2, y2 = pdf_bbox
+    long_side_pt = max(x2 - x1, y2 - y1)
+    if long_side_pt <= 0:
+        return MAX_ZOOM
+    # 렌더링 영역을 픽셀 경계로 넓히면서 양 끝이 1픽셀씩 커질 수 있으므로 그만큼 덜 확대
+    return max(MIN_ZOOM, min(MAX_ZOOM, (target_long_side - 2) / long_side_pt))
+
+
+def _render_bbox(
+    page: Union[fitz.Page, fitz.DisplayList],
+    pdf_bbox: List[float],
+    mat: fitz.Matrix,
+    colorspace: fitz.Colorspace = fitz.csRGB
+) -> bytes:
+    """
+    열려 있는 페이지(또는 페이지의 DisplayList)에서 bbox 영역만 렌더링해 PNG 바이트로 반환
+    (호출 측에서 _FITZ_LOCK을 잡고 있어야 함)
+    """
+    x1, y1, x2, y2 = pdf_bbox
+    
+    # PyMuPDF는 왼쪽 상단이 원점이므로 그대로 사용
+    rect = fitz.Rect(x1, y1, x2, y2)
+    
+    # 해당 영역을 이미지로 렌더링 (mat의 zoom으로 해상도 조절)
+    # 알파 채널 없이 렌더링 (투명도는 VLM 입력에 필요 없음)
+    pix = page.get_pixmap(matrix=mat, clip=rect, colorspace=colorspace, alpha=False)
+    
+    # PIL 디코딩/재인코딩 없이 PNG로 한 번만 인코딩 (저장 시 바이트를 그대로 씀)
+    return pix.tobytes("png")
+
 
 def extract_image_from_pdf_bbox(
     pdf_path: Path,
     pdf_bbox: List[float],
     page_index: int = 0,
-    zoom: float = 2.0
-) -> Optional[Image.Image]:
+    zoom: Optional[float] = None,
+    colorspace: fitz.Colorspace = fitz.csRGB,
+    target_long_side: int = DEFAULT_TARGET_LONG_SIDE
+) -> Optional[bytes]:
     """
     PDF에서 지정된 bbox 영역을 이미지로 추출
+    (블록 하나만 추출할 때 사용, 여러 블록은 문서를 한 번 열고 _render_bbox 사용)
     
     Args:
         pdf_path: PDF 파일 경로
         pdf_bbox: PDF 좌표 [x1, y1, x2, y2] (포인트 단위)
         page_index: 페이지 인덱스 (0부터 시작)
-        zoom: 이미지 확대 배율 (해상도 향상용, 기본값 2.0)
+        zoom: 이미지 확대 배율 (None이면 bbox 크기에 맞춰 자동 계산)
+        colorspace: 렌더링 색 공간 (기본값 RGB, 흑백은 fitz.csGRAY)
+        target_long_side: zoom 자동 계산 시 이미지 긴 변의 목표 픽셀 수
     
     Returns:
-        PIL Image 객체 또는 None
+        PNG 이미지 바이트 또는 None
     """
     if len(pdf_bbox) != 4:
         return None
     
+    if zoom is None:
+        zoom = _adaptive_zoom(pdf_bbox, target_long_side)
+    
     try:
-        doc = fitz.open(str(pdf_path))
-        if page_index >= len(doc):
-            doc.close()
-            return None
-        
-        page = doc[page_index]
-        x1, y1, x2, y2 = pdf_bbox
-        
-        # PyMuPDF는 왼쪽 상단이 원점이므로 그대로 사용
-        rect = fitz.Rect(x1, y1, x2, y2)
-        
-        # 해당 영역을 이미지로 렌더링 (zoom으로 해상도 조절)
-        mat = fitz.Matrix(zoom, zoom)
-        pix = page.get_pixmap(matrix=mat, clip=rect)
-        
-        # PIL Image로 변환
-        img_data = pix.tobytes("png")
-        img = Image.open(io.BytesIO(img_data))
-        
-        doc.close()
-        return img
+        # with 블록으로 열어 렌더링 중 예외가 나도 문서가 닫히도록 함
+        with _FITZ_LOCK, fitz.open(str(pdf_path)) as doc:
+            if page_index >= len(doc):
+                return None
+            return _render_bbox(doc[page_index], pdf_bbox, fitz.Matrix(zoom, zoom), colorspace)
     except Exception as e:
         logger.error(f"이미지 추출 실패 ({pdf_path}, page {page_index}): {e}", exc_info=True)
         return None
 
 
 def save_block_image(
-    img: Image.Image,
+    png_bytes: bytes,
     vlm_images_dir: Path,
     block_id: str,
     block_label: str
@@ -77,7 +128,7 @@ def save_block_image(
     블록 이미지를 vlm_images 폴더의 타입별 하위 폴더에 저장
     
     Args:
-        img: PIL Image 객체
+        png_bytes: PNG 이미지 바이트
         vlm_images_dir: vlm_images 디렉토리 경로 (예: output/test/layout_parsing_output/vlm_images)
         block_id: 블록 식별자 (예: "page_0001_0_res_block_3")
         block_label: 블록 라벨 (예: "table", "chart", "figure")
@@ -92,14 +143,30 @@ def save_block_image(
         
         filename = f"{block_id}.png"
         filepath = type_dir / filename
-        img.save(filepath, "PNG")
-        logger.debug(f"이미지 저장 완료: {filepath}")
+        # 임시 파일에 쓴 뒤 교체해 중간에 실패해도 잘린 PNG가 남지 않도록 함
+        atomic_write(filepath, png_bytes)
+        logger.debug("이미지 저장 완료: %s", filepath)
         return filepath
     except Exception as e:
         logger.error(f"이미지 저장 실패 ({block_id}): {e}", exc_info=True)
         return None
 
 
+def _is_cached_image(filepath: Path, source_mtime: float) -> bool:
+    """이미 저장된 블록 이미지가 원본 PDF보다 새롭고 비어 있지 않으면 재사용 가능"""
+    try:
+        stat = filepath.stat()
+    except OSError:
+        return False
+    return stat.st_size > 0 and stat.st_mtime >= source_mtime
+
+
+def _bbox_top(block: Dict, default: float) -> float:
+    """블록 pdf_bbox의 위쪽 y 좌표 (bbox가 없으면 default)"""
+    pdf_bbox = block.get('pdf_bbox', [])
+    return pdf_bbox[1] if len(pdf_bbox) >= 2 else default
+
+
 def estimate_block_order_for_null_blocks(parsing_res_list: List[Dict]) -> List[Dict]:
     """
     같은 페이지 내에서 block_order가 null인 모든 블록의 block_order를 추정
@@ -112,13 +179,16 @@ def estimate_block_order_for_null_blocks(parsing_res_list: List[Dict]) -> List[D
     Returns:
         block_order가 추정된 블록 리스트
     """
-    # 같은 페이지 내에서 pdf_bbox y 좌표로 정렬
-    sorted_blocks = sorted(
-        parsing_res_list,
-        key=lambda b: (
-            b.get('pdf_bbox', [0, 999999])[1] if len(b.get('pdf_bbox', [])) >= 2 else 999999
-        )
+    # 블록마다 pdf_bbox 위쪽 y 좌표를 한 번만 계산 (bbox가 없으면 None)
+    tops = [_bbox_top(block, None) for block in parsing_res_list]
+    
+    # 같은 페이지 내에서 pdf_bbox y 좌표로 정렬 (bbox 없는 블록은 맨 뒤)
+    # (원본 인덱스를 함께 정렬해 두어 결과 반영 시 인덱스를 다시 찾지 않음)
+    sorted_indices = sorted(
+        range(len(parsing_res_list)),
+        key=lambda i: 999999 if tops[i] is None else tops[i]
     )
+    sorted_blocks = [parsing_res_list[i] for i in sorted_indices]
     
     # block_order가 있는 블록들 찾기
     ordered_blocks = [
@@ -127,13 +197,12 @@ def estimate_block_order_for_null_blocks(parsing_res_list: List[Dict]) -> List[D
     ]
     
     updated_list = parsing_res_list.copy()
-    block_to_index = {id(block): i for i, block in enumerate(parsing_res_list)}
     
     # block_order가 있는 블록이 없는 경우: block_id 순서대로 1, 2, 3... 으로 배치
     if not ordered_blocks:
         logger.debug("block_order가 있는 블록이 없습니다. block_id 순서대로 추정합니다.")
         null_blocks = [
-            (i, block) for i, block in enumerate(sorted_blocks)
+            (original_idx, block) for original_idx, block in zip(sorted_indices, sorted_blocks)
             if block.get('block_order') is None
         ]
         
@@ -141,108 +210,66 @@ def estimate_block_order_for_null_blocks(parsing_res_list: List[Dict]) -> List[D
             # block_id 순서대로 정렬
             null_blocks.sort(key=lambda x: x[1].get('block_id', 0))
             
-            for k, (j, null_block) in enumerate(null_blocks):
+            for k, (original_idx, null_block) in enumerate(null_blocks):
                 estimated_order = k + 1  # 1부터 시작
-                original_idx = block_to_index.get(id(null_block))
-                if original_idx is not None:
-                    updated_list[original_idx]['block_order'] = estimated_order
-                    logger.debug(f"block_order 추정 (ordered 블록 없음): {null_block.get('block_label')} "
-                               f"(block_id={null_block.get('block_id')}, block_idx={original_idx}) -> {estimated_order}")
+                updated_list[original_idx]['block_order'] = estimated_order
+                logger.debug(f"block_order 추정 (ordered 블록 없음): {null_block.get('block_label')} "
+                           f"(block_id={null_block.get('block_id')}, block_idx={original_idx}) -> {estimated_order}")
         
         return updated_list
     
     
-    # ordered 블록들 사이의 구간을 찾아서 null 블록들을 배치
-    for i in range(len(ordered_blocks) - 1):
-        prev_idx, prev_block = ordered_blocks[i]
-        next_idx, next_block = ordered_blocks[i + 1]
-        
-        prev_order = prev_block.get('block_order')
-        next_order = next_block.get('block_order')
-        prev_y = prev_block.get('pdf_bbox', [0, 0])[1] if len(prev_block.get('pdf_bbox', [])) >= 2 else 0
-        next_y = next_block.get('pdf_bbox', [0, 0])[1] if len(next_block.get('pdf_bbox', [])) >= 2 else 0
+    # 정렬 순서로 ordered 블록 앞 / ordered 블록 사이 / ordered 블록 뒤 구간을 한 번씩만 훑으며
+    # 각 구간의 null 블록들을 배치 (구간 비교에서는 bbox 없는 블록의 y를 0으로 취급)
+    sorted_ys = [0 if tops[i] is None else tops[i] for i in sorted_indices]
+    first_order = ordered_blocks[0][1].get('block_order')
+    last_order = ordered_blocks[-1][1].get('block_order')
+    boundaries = [None] + [idx for idx, _ in ordered_blocks] + [None]
+    
+    for prev_idx, next_idx in zip(boundaries, boundaries[1:]):
+        start = 0 if prev_idx is None else prev_idx + 1
+        end = len(sorted_blocks) if next_idx is None else next_idx
+        prev_y = None if prev_idx is None else sorted_ys[prev_idx]
+        next_y = None if next_idx is None else sorted_ys[next_idx]
         
-        # 두 ordered 블록 사이에 있는 null 블록들 찾기 (block_label 무관)
+        # 구간 안의 null 블록 중 앞뒤 ordered 블록의 y 사이에 있는 블록만 대상 (block_label 무관)
         null_blocks_in_range = []
-        for j in range(prev_idx + 1, next_idx):
+        for j in range(start, end):
             block = sorted_blocks[j]
-            
-            # block_order가 null인 모든 블록 처리 (block_label 체크 제거)
-            if block.get('block_order') is None:
-                block_y = block.get('pdf_bbox', [0, 0])[1] if len(block.get('pdf_bbox', [])) >= 2 else 0
-                if prev_y < block_y < next_y:
-                    null_blocks_in_range.append((j, block, block_y))
+            if block.get('block_order') is not None:
+                continue
+            block_y = sorted_ys[j]
+            if (prev_y is None or prev_y < block_y) and (next_y is None or block_y < next_y):
+                null_blocks_in_range.append((j, block, block_y))
+        
+        if not null_blocks_in_range:
+            continue
         
         # y 좌표 순서대로 정렬
         null_blocks_in_range.sort(key=lambda x: x[2])
+        count = len(null_blocks_in_range)
         
-        # null 블록들을 균등하게 배치
-        if null_blocks_in_range:
-            # 구간 길이 계산
-            order_range = next_order - prev_order
-            # null 블록 개수 + 1로 나눠서 간격 계산
-            step = order_range / (len(null_blocks_in_range) + 1)
-            
-            for k, (j, null_block, _) in enumerate(null_blocks_in_range):
-                estimated_order = prev_order + step * (k + 1)
-                
-                # 원본 리스트에서 인덱스 찾기
-                original_idx = block_to_index.get(id(null_block))
-                if original_idx is not None:
-                    updated_list[original_idx]['block_order'] = estimated_order
-                    logger.debug(f"block_order 추정: {null_block.get('block_label')} "
-                               f"(block_idx={original_idx}) -> {estimated_order:.2f} "
-                               f"(구간: {prev_order} ~ {next_order}, {len(null_blocks_in_range)}개 블록)")
-    
-    # 첫 번째 ordered 블록보다 위에 있는 null 블록들 처리
-    first_idx, first_block = ordered_blocks[0]
-    first_order = first_block.get('block_order')
-    first_y = first_block.get('pdf_bbox', [0, 0])[1] if len(first_block.get('pdf_bbox', [])) >= 2 else 0
-    
-    null_blocks_before = []
-    for j in range(first_idx):
-        block = sorted_blocks[j]
-        # block_order가 null인 모든 블록 처리 (block_label 체크 제거)
-        if block.get('block_order') is None:
-            block_y = block.get('pdf_bbox', [0, 0])[1] if len(block.get('pdf_bbox', [])) >= 2 else 0
-            if block_y < first_y:
-                null_blocks_before.append((j, block, block_y))
-    
-    null_blocks_before.sort(key=lambda x: x[2])
-    if null_blocks_before:
-        step = 0.1  # 첫 번째 블록보다 위면 0.1 간격으로 배치
-        for k, (j, null_block, _) in enumerate(null_blocks_before):
-            estimated_order = first_order - step * (len(null_blocks_before) - k)
-            original_idx = block_to_index.get(id(null_block))
-            if original_idx is not None:
-                updated_list[original_idx]['block_order'] = estimated_order
-                logger.debug(f"block_order 추정 (첫 블록 위): {null_block.get('block_label')} "
-                           f"(block_idx={original_idx}) -> {estimated_order:.2f}")
-    
-    # 마지막 ordered 블록보다 아래에 있는 null 블록들 처리
-    last_idx, last_block = ordered_blocks[-1]
-    last_order = last_block.get('block_order')
-    last_y = last_block.get('pdf_bbox', [0, 0])[1] if len(last_block.get('pdf_bbox', [])) >= 2 else 0
-    
-    null_blocks_after = []
-    for j in range(last_idx + 1, len(sorted_blocks)):
-        block = sorted_blocks[j]
-        # block_order가 null인 모든 블록 처리 (block_label 체크 제거)
-        if block.get('block_order') is None:
-            block_y = block.get('pdf_bbox', [0, 0])[1] if len(block.get('pdf_bbox', [])) >= 2 else 0
-            if block_y > last_y:
-                null_blocks_after.append((j, block, block_y))
-    
-    null_blocks_after.sort(key=lambda x: x[2])
-    if null_blocks_after:
-        step = 0.1  # 마지막 블록보다 아래면 0.1 간격으로 배치
-        for k, (j, null_block, _) in enumerate(null_blocks_after):
-            estimated_order = last_order + step * (k + 1)
-            original_idx = block_to_index.get(id(null_block))
-            if original_idx is not None:
-                updated_list[original_idx]['block_order'] = estimated_order
-                logger.debug(f"block_order 추정 (마지막 블록 아래): {null_block.get('block_label')} "
-                           f"(block_idx={original_idx}) -> {estimated_order:.2f}")
+        if prev_idx is None:
+            # 첫 번째 ordered 블록보다 위: 0.1 간격으로 배치
+            orders = [first_order - 0.1 * (count - k) for k in range(count)]
+            position = "첫 블록 위"
+        elif next_idx is None:
+            # 마지막 ordered 블록보다 아래: 0.1 간격으로 배치
+            orders = [last_order + 0.1 * (k + 1) for k in range(count)]
+            position = "마지막 블록 아래"
+        else:
+            # 두 ordered 블록 사이: 구간을 null 블록 개수 + 1로 나눠 균등하게 배치
+            prev_order = sorted_blocks[prev_idx].get('block_order')
+            next_order = sorted_blocks[next_idx].get('block_order')
+            step = (next_order - prev_order) / (count + 1)
+            orders = [prev_order + step * (k + 1) for k in range(count)]
+            position = f"구간: {prev_order} ~ {next_order}, {count}개 블록"
+        
+        for (j, null_block, _), estimated_order in zip(null_blocks_in_range, orders):
+            original_idx = sorted_indices[j]
+            updated_list[original_idx]['block_order'] = estimated_order
+            logger.debug(f"block_order 추정 ({position}): {null_block.get('block_label')} "
+                       f"(block_idx={original_idx}) -> {estimated_order:.2f}")
     
     # 처리되지 않은 null 블록들 확인 (fallback: block_id 순서대로 배치)
     remaining_null_blocks = []
@@ -273,7 +300,10 @@ def estimate_block_order_for_null_blocks(parsing_res_list: List[Dict]) -> List[D
 def extract_vlm_block_images(
     json_path: Path,
     pdf_pages_dir: Path,
-    vlm_images_dir: Path
+    vlm_images_dir: Path,
+    zoom: Optional[float] = None,
+    target_long_side: Optional[int] = None,
+    skip_existing: bool = False
 ) -> Dict:
     """
     JSON 파일의 VLM 처리 대상 블록들(table, chart, figure)의 이미지를 추출하여 vlm_images 폴더에 저장
@@ -283,13 +313,20 @@ def extract_vlm_block_images(
         json_path: 레이아웃 파싱 결과 JSON 파일 경로
         pdf_pages_dir: PDF 분할 파일들이 있는 디렉토리
         vlm_images_dir: vlm_images 디렉토리 경로 (vlm_images/table/, vlm_images/chart/, vlm_images/figure/ 생성됨)
+        zoom: 이미지 확대 배율 (None이면 블록마다 bbox 크기에 맞춰 자동 계산)
+        target_long_side: zoom 자동 계산 시 이미지 긴 변의 목표 픽셀 수
+            (큰 그림은 과도하게 커지지 않고 작은 차트는 충분한 해상도로 렌더링됨,
+            None이면 블록 라벨별 기본값: TARGET_LONG_SIDE_BY_LABEL, 그 외 DEFAULT_TARGET_LONG_SIDE)
+        skip_existing: True이면 원본 PDF보다 새로 저장된 블록 이미지가 있을 때 다시 렌더링하지 않음
+            (중단된 실행을 이어서 할 때 바뀐 페이지만 렌더링)
+            파일 이름과 수정 시각만 비교하므로 bbox, zoom, 블록 라벨이 바뀌어도 알아채지 못함
+            → 레이아웃 파싱을 다시 실행한 뒤에는 켜지 말 것 (기본값 False)
     
     Returns:
         업데이트된 데이터 딕셔너리
     """
     # JSON 파일 읽기
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(json_path)
     
     page_index = data.get("page_index", 0)
     parsing_res_list = data.get("parsing_res_list", [])
@@ -298,6 +335,11 @@ def extract_vlm_block_images(
     parsing_res_list = estimate_block_order_for_null_blocks(parsing_res_list)
     data["parsing_res_list"] = parsing_res_list
     
+    # VLM 처리 대상 블록이 없으면 PDF를 열 필요 없음
+    if not any(block.get("block_label", "") in VLM_BLOCK_LABELS for block in parsing_res_list):
+        logger.debug(f"VLM 처리 대상 블록 없음: {json_path.name}")
+        return data
+    
     # PDF 파일 경로 찾기
     pdf_filename = f"page_{page_index+1:04d}.pdf"
     pdf_path = pdf_pages_dir / pdf_filename
@@ -306,47 +348,142 @@ def extract_vlm_block_images(
         logger.warning(f"PDF 파일을 찾을 수 없습니다: {pdf_path}")
         return data
     
-    # VLM 처리 대상 블록 라벨
-    vlm_block_labels = ["table", "chart", "figure", "image", "formula"]
+    json_stem = Path(json_path).stem  # page_0001_0_res
+    pdf_mtime = pdf_path.stat().st_mtime if skip_existing else None
     
-    # VLM 처리 대상 블록 처리
+    # PDF는 페이지당 한 번만 열고 같은 페이지의 DisplayList로 모든 VLM 블록을 렌더링
+    # (잠금은 렌더링 동안만 잡고, 이미지 저장은 잠금 밖에서 수행)
+    rendered_images = []
+    try:
+        with _FITZ_LOCK, fitz.open(str(pdf_path)) as doc:
+            if len(doc) == 0:
+                return data
+            page = doc[0]
+            page_rect = page.rect
+            
+            # 페이지 내용은 DisplayList로 한 번만 해석하고 블록마다 clip 영역만 래스터화
+            # (page.get_pixmap(clip=...)은 호출할 때마다 페이지 내용 스트림을 다시 해석함)
+            # 모든 블록이 캐시된 이미지로 건너뛰어지면 만들지 않도록 처음 렌더링할 때 생성
+            display_list = None
+            
+            # zoom이 고정이면 확대 행렬은 모든 블록에 공통이므로 한 번만 생성
+            fixed_mat = fitz.Matrix(zoom, zoom) if zoom is not None else None
+            
+            for block_idx, block in enumerate(parsing_res_list):
+                block_label = block.get("block_label", "")
+                
+                # VLM 처리 대상 블록만 처리
+                if block_label not in VLM_BLOCK_LABELS:
+                    continue
+                
+                pdf_bbox = block.get("pdf_bbox", [])
+                if not pdf_bbox or len(pdf_bbox) != 4:
+                    continue
+                
+                # 넓이가 없거나 페이지 밖에 있는 bbox는 렌더링하지 않음
+                if not _has_visible_area(pdf_bbox, page_rect):
+                    logger.warning(f"렌더링할 영역이 없는 bbox 건너뜀: {block_label} (block {block_idx}, {pdf_bbox})")
+                    continue
+                
+                # 이전 실행에서 저장한 이미지가 유효하면 렌더링/인코딩 생략
+                if skip_existing:
+                    cached_path = vlm_images_dir / block_label / f"{json_stem}_block_{block_idx}.png"
+                    if _is_cached_image(cached_path, pdf_mtime):
+                        rendered_images.append((block_idx, block_label, None))
+                        continue
+                
+                mat = fixed_mat
+                if mat is None:
+                    block_zoom = _adaptive_zoom(
+                        pdf_bbox,
+                        target_long_side or TARGET_LONG_SIDE_BY_LABEL.get(block_label, DEFAULT_TARGET_LONG_SIDE)
+                    )
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("렌더링 zoom: %s (block %d) -> %.2f", block_label, block_idx, block_zoom)
+                    mat = fitz.Matrix(block_zoom, block_zoom)
+                
+                # PDF에서 해당 영역을 이미지로 추출
+                try:
+                    colorspace = fitz.csGRAY if block_label in GRAYSCALE_BLOCK_LABELS else fitz.csRGB
+                    if display_list is None:
+                        display_list = page.get_displaylist()
+                    png_bytes = _render_bbox(display_list, pdf_bbox, mat, colorspace)
+                except Exception as e:
+                    logger.error(f"이미지 추출 실패 ({pdf_path}, block {block_idx}): {e}", exc_info=True)
+                    continue
+                rendered_images.append((block_idx, block_label, png_bytes))
+    except Exception as e:
+        logger.error(f"PDF 열기 실패 ({pdf_path}): {e}", exc_info=True)
+        return data
+    
+    # VLM 처리 대상 블록 이미지 저장
     processed_count = 0
-    for block_idx, block in enumerate(parsing_res_list):
-        block_label = block.get("block_label", "")
+    for block_idx, block_label, png_bytes in rendered_images:
+        # 블록 식별자 생성
+        block_id = f"{json_stem}_block_{block_idx}"
         
-        # VLM 처리 대상 블록만 처리
-        if block_label in vlm_block_labels:
-            pdf_bbox = block.get("pdf_bbox", [])
-            if pdf_bbox and len(pdf_bbox) == 4:
-                # PDF에서 해당 영역을 이미지로 추출
-                img = extract_image_from_pdf_bbox(pdf_path, pdf_bbox, page_index=0)
-                
-                if img:
-                    # 블록 식별자 생성
-                    json_stem = Path(json_path).stem  # page_0001_0_res
-                    block_id = f"{json_stem}_block_{block_idx}"
-                    
-                    # 이미지 저장 (vlm_images/{block_label}/ 폴더에 저장)
-                    img_path = save_block_image(img, vlm_images_dir, block_id, block_label)
-                    
-                    if img_path:
-                        # block_content는 비워둠 (VLM 처리 단계에서 채워짐)
-                        # block_content는 VLM 처리 후 채워지므로 여기서는 업데이트하지 않음
-                        processed_count += 1
-                        logger.debug(f"이미지 추출 완료: {block_label} ({block_id}) -> {img_path.name}")
-                    else:
-                        logger.error(f"이미지 저장 실패: {block_id}")
+        # 이미지 저장 (vlm_images/{block_label}/ 폴더에 저장, 재사용하는 이미지는 그대로 둠)
+        if png_bytes is None:
+            img_path = vlm_images_dir / block_label / f"{block_id}.png"
+        else:
+            img_path = save_block_image(png_bytes, vlm_images_dir, block_id, block_label)
+        
+        if img_path:
+            # block_content는 VLM 처리 후 채워지므로 여기서는 업데이트하지 않음
+            processed_count += 1
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("이미지 추출 완료: %s (%s) -> %s", block_label, block_id, img_path.name)
+        else:
+            logger.error(f"이미지 저장 실패: {block_id}")
     
     logger.info(f"이미지 추출 완료: {processed_count}개 블록 ({json_path.name})")
     
     return data
 
 
+def _extract_and_save_page(
+    json_file: Path,
+    pdf_pages_dir: Path,
+    vlm_images_dir: Path,
+    output_dir: Optional[Path],
+    pretty: bool = False,
+    skip_existing: bool = False
+) -> Path:
+    """JSON 파일 하나의 이미지 추출 후 결과 JSON 저장"""
+    logger.debug(f"처리 중: {json_file.name}")
+    
+    # 이미지 추출
+    updated_data = extract_vlm_block_images(
+        json_file, pdf_pages_dir, vlm_images_dir, skip_existing=skip_existing
+    )
+    
+    # 결과 저장
+    output_file = output_dir / json_file.name if output_dir else json_file
+    dump_json(updated_data, output_file, pretty)
+    
+    logger.debug(f"저장 완료: {output_file.name}")
+    return output_file
+
+
+def _init_worker_logging(level: int) -> None:
+    """프로세스 워커 로깅 초기화 (forkserver 워커는 부모의 핸들러를 물려받지 않음)"""
+    if not logging.getLogger().handlers:
+        logging.basicConfig(
+            level=level,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            handlers=[logging.StreamHandler(sys.stdout)]
+        )
+
+
 def extract_all_vlm_block_images(
     parsing_results_dir: Path,
     pdf_pages_dir: Path,
     vlm_images_dir: Path,
-    output_dir: Path = None
+    output_dir: Path = None,
+    max_workers: Optional[int] = None,
+    pretty: bool = False,
+    executor: str = "process",
+    skip_existing: bool = False
 ) -> List[Path]:
     """
     parsing_results 디렉토리의 모든 JSON 파일에서 VLM 처리 대상 블록의 이미지를 추출
@@ -357,10 +494,22 @@ def extract_all_vlm_block_images(
         pdf_pages_dir: PDF 분할 파일들이 있는 디렉토리
         vlm_images_dir: vlm_images 디렉토리 경로 (vlm_images/table/, vlm_images/chart/, vlm_images/figure/ 생성됨)
         output_dir: JSON 출력 디렉토리 (None이면 원본 파일 덮어쓰기)
+        max_workers: 페이지 단위 워커 수 (None 또는 0이면 프로세스 풀은 CPU 코어 수,
+            스레드 풀은 CPU 수의 2배(최대 16), 파일 수를 넘지 않음)
+        pretty: True이면 들여쓰기 2칸으로 저장 (기본은 compact,
+            DOCLAYOUT_DEBUG 환경 변수로도 켤 수 있음)
+        executor: 병렬 처리 방식 ("process": 프로세스 풀, "thread": 스레드 풀)
+            프로세스 풀은 워커마다 PyMuPDF를 따로 가지므로 렌더링까지 병렬로 실행되고,
+            스레드 풀은 렌더링이 _FITZ_LOCK으로 직렬화되어 파일 쓰기만 겹쳐 실행됨
+        skip_existing: True이면 원본 PDF보다 새로 저장된 블록 이미지는 다시 렌더링하지 않음
+            (bbox/zoom 변경은 감지하지 못하므로 같은 레이아웃 결과로 이어서 실행할 때만 사용, 기본값 False)
     
     Returns:
         처리된 JSON 파일 경로 리스트
     """
+    if executor not in ("process", "thread"):
+        raise ValueError(f"지원하지 않는 executor: {executor} (process 또는 thread)")
+    
     # JSON 파일들 찾기
     json_files = sorted(parsing_results_dir.glob("*_res.json"))
     
@@ -371,28 +520,63 @@ def extract_all_vlm_block_images(
     logger.info(f"이미지 추출 시작: {len(json_files)}개 JSON 파일")
     logger.info(f"이미지 저장 위치: {vlm_images_dir}")
     
-    processed_files = []
-    
-    for json_file in json_files:
-        logger.debug(f"처리 중: {json_file.name}")
-        
-        # 이미지 추출
-        updated_data = extract_vlm_block_images(
-            json_file, pdf_pages_dir, vlm_images_dir
-        )
-        
-        # 결과 저장
-        if output_dir:
-            output_dir.mkdir(parents=True, exist_ok=True)
-            output_file = output_dir / json_file.name
+    if output_dir:
+        output_dir.mkdir(parents=True, exist_ok=True)
+    
+    pretty = pretty or is_pretty_json_enabled()
+    
+    # 프로세스는 CPU 수보다 많이 띄워도 이득이 없고, 스레드는 렌더링 외 I/O를 겹치므로 조금 더 띄움
+    cpu_count = os.cpu_count() or 1
+    if executor == "process":
+        max_workers = min(max_workers or cpu_count, cpu_count)
+    else:
+        max_workers = max_workers or min(16, cpu_count * 2)
+    max_workers = max(1, min(max_workers, len(json_files)))
+    logger.info(f"병렬 처리 워커 수: {max_workers} ({executor})")
+    
+    if max_workers == 1:
+        # 워커가 하나면 JSON 저장을 별도 스레드에 맡겨 다음 페이지 렌더링과 겹쳐 실행
+        processed_files = []
+        with ThreadPoolExecutor(max_workers=1) as io_pool:
+            write_futures = []
+            for json_file in json_files:
+                updated_data = extract_vlm_block_images(
+                    json_file, pdf_pages_dir, vlm_images_dir, skip_existing=skip_existing
+                )
+                output_file = output_dir / json_file.name if output_dir else json_file
+                write_futures.append(io_pool.submit(dump_json, updated_data, output_file, pretty))
+                processed_files.append(output_file)
+            # 저장 실패는 기존과 같이 호출 측으로 전파
+            for future in write_futures:
+                future.result()
+    else:
+        if executor == "thread":
+            pool = ThreadPoolExecutor(max_workers=max_workers)
         else:
-            output_file = json_file
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(updated_data, f, ensure_ascii=False, indent=2)
-        
-        processed_files.append(output_file)
-        logger.debug(f"저장 완료: {output_file.name}")
+            # 가능하면 forkserver로 띄워 부모의 스레드/잠금 상태를 물려받지 않도록 함
+            mp_context = None
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                mp_context = multiprocessing.get_context("forkserver")
+            pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=mp_context,
+                initializer=_init_worker_logging,
+                initargs=(logging.getLogger().getEffectiveLevel(),)
+            )
+        # 페이지 순으로 정렬된 파일을 연속 묶음으로 나눠 보내 IPC 횟수를 줄임 (스레드 풀에서는 무시됨)
+        chunksize = max(1, len(json_files) // (max_workers * 4))
+        # map으로 파일 순서를 유지하며 결과 수집
+        with pool as ex:
+            processed_files = list(ex.map(
+                _extract_and_save_page,
+                json_files,
+                repeat(pdf_pages_dir),
+                repeat(vlm_images_dir),
+                repeat(output_dir),
+                repeat(pretty),
+                repeat(skip_existing),
+                chunksize=chunksize
+            ))
     
     logger.info(f"이미지 추출 완료: {len(processed_files)}개 파일 처리")
     logger.info("이미지 저장 위치:")
@@ -1,19 +1,13 @@
 """VLM을 사용한 table, chart, figure 처리 (이미 추출된 이미지 사용)"""
 from pathlib import Path
 from typing import List, Dict, Optional
-import json
 import logging
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# 로깅 설정은 실행 진입점(main.py 등)에서 담당
 logger = logging.getLogger(__name__)
 
 # 프로젝트 루트를 경로에 추가 (vlm_server 모듈 import용)
@@ -21,6 +15,8 @@ _project_root = Path(__file__).parent.parent
 if str(_project_root) not in sys.path:
     sys.path.insert(0, str(_project_root))
 
+from object_parsing.json_io import dump_json, load_json
+
 # VLM 클라이언트 import
 try:
     from services.vlm_server.qwen3_vl_client import create_qwen3vl_client, Qwen3VLClient
@@ -29,6 +25,10 @@ except ImportError:
     Qwen3VLClient = None
     create_qwen3vl_client = None
 
+# VLM 처리 대상 블록 라벨 (수집 순서용 튜플, 포함 여부 검사용 frozenset)
+VLM_BLOCK_LABEL_ORDER = ("table", "chart", "figure", "image", "formula")
+VLM_BLOCK_LABELS = frozenset(VLM_BLOCK_LABEL_ORDER)
+
 
 # 기본 VLM 프롬프트 (사용자가 커스터마이즈 가능)
 DEFAULT_VLM_PROMPTS = {
@@ -57,6 +57,21 @@ LaTeX 코드만 반환하고, 설명이나 다른 텍스트는 포함하지 마
 }
 
 
+def _scan_png_names(type_dir: Path) -> List[str]:
+    """
+    type_dir 안의 PNG 파일 이름 목록 (이름순)
+    
+    scandir로 폴더를 한 번만 훑어 파일마다 stat을 따로 호출하지 않음, 폴더가 없으면 빈 리스트
+    """
+    try:
+        with os.scandir(type_dir) as it:
+            png_names = [e.name for e in it if e.name.endswith(".png") and e.is_file()]
+    except FileNotFoundError:
+        return []
+    png_names.sort()
+    return png_names
+
+
 def collect_all_vlm_images(
     vlm_images_dir: Path,
     block_label: Optional[str] = None
@@ -74,7 +89,7 @@ def collect_all_vlm_images(
           "img_path": Path, "json_stem": "page_0001_0_res", "block_idx": 0}, ...]
         block_label는 "table", "chart", "figure", "image", "formula" 중 하나
     """
-    vlm_block_labels = ["table", "chart", "figure", "image", "formula"] if block_label is None else [block_label]
+    vlm_block_labels = VLM_BLOCK_LABEL_ORDER if block_label is None else (block_label,)
     collected_images = []
     
     for label in vlm_block_labels:
@@ -85,20 +100,17 @@ def collect_all_vlm_images(
         
         logger.debug(f"이미지 디렉토리 확인: {type_dir}")
         # 해당 폴더의 모든 PNG 파일 찾기
-        png_files = list(sorted(type_dir.glob("*.png")))
-        logger.info(f"  {label} 폴더에서 {len(png_files)}개 이미지 발견")
-        for img_path in png_files:
+        png_names = _scan_png_names(type_dir)
+        logger.info(f"  {label} 폴더에서 {len(png_names)}개 이미지 발견")
+        for png_name in png_names:
+            img_path = type_dir / png_name
             # block_id 추출: 파일명에서 확장자 제거
-            block_id = img_path.stem  # 예: "page_0001_0_res_block_0"
+            block_id = png_name[:-4]  # 예: "page_0001_0_res_block_0"
             
-            # JSON 파일명과 block_idx 추출
-            if "_block_" in block_id:
-                json_stem = "_".join(block_id.split("_block_")[:-1])  # "page_0001_0_res"
-                block_idx_str = block_id.split("_block_")[-1]  # "0"
-                try:
-                    block_idx = int(block_idx_str)
-                except ValueError:
-                    block_idx = -1
+            # JSON 파일명과 block_idx 추출 (마지막 "_block_" 기준으로 한 번만 나눔)
+            json_stem, sep, block_idx_str = block_id.rpartition("_block_")  # "page_0001_0_res", "0"
+            if sep:
+                block_idx = int(block_idx_str) if block_idx_str.isdecimal() else -1
             else:
                 json_stem = block_id
                 block_idx = -1
@@ -158,6 +170,56 @@ def create_vlm_functions_from_client(
     }
 
 
+def _resolve_json_stem(json_stem: str, known_stems: Dict[str, Path]) -> Optional[str]:
+    """
+    이미지 파일명의 json_stem에 해당하는 JSON 파일 stem 찾기
+    ({json_stem}, {json_stem}_0_res, {json_stem}*_res 순으로 확인, 파일 시스템 조회 없음)
+    """
+    if json_stem in known_stems:
+        return json_stem
+    
+    alt_stem = f"{json_stem}_0_res"
+    if alt_stem in known_stems:
+        return alt_stem
+    
+    # {json_stem}*_res 패턴: 앞부분이 json_stem이고 뒤에 _res가 붙은 파일
+    for stem in known_stems:
+        if stem.startswith(json_stem) and stem.endswith("_res") and len(stem) >= len(json_stem) + 4:
+            return stem
+    return None
+
+
+def _run_vlm_on_image(
+    img_path: Path,
+    block_label: str,
+    block_id: str,
+    vlm_functions: Optional[Dict[str, callable]]
+) -> str:
+    """이미지 하나를 VLM 함수로 처리해 block_content에 넣을 문자열 반환 (실패 시 오류 문자열)"""
+    # VLM 함수가 없으면 이미지를 디코딩할 필요 없음
+    vlm_function = vlm_functions.get(block_label) if vlm_functions else None
+    if not vlm_function:
+        logger.warning(f"VLM 함수 없음: {block_label} ({block_id})")
+        return "[VLM 함수 없음]"
+    
+    try:
+        img = Image.open(img_path)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("이미지 로드 완료: %s (%s)", img_path.name, img.size)
+        
+        logger.info(f"VLM 처리 시작: {block_label} ({block_id})")
+        content = vlm_function(img)
+        logger.info(f"VLM 처리 완료: {block_label} ({block_id}) - {len(content)} chars")
+        # 처음 100자만 로그에 출력 (DEBUG가 꺼져 있으면 미리보기 문자열을 만들지 않음)
+        if logger.isEnabledFor(logging.DEBUG):
+            preview = content[:100] + "..." if len(content) > 100 else content
+            logger.debug("  내용 미리보기: %s", preview)
+        return content
+    except Exception as e:
+        logger.error(f"VLM 처리 실패 ({block_id}): {e}", exc_info=True)
+        return f"[VLM 처리 실패: {e}]"
+
+
 def process_vlm_blocks_from_images(
     parsing_results_dir: Path,
     vlm_images_dir: Path,
@@ -167,7 +229,8 @@ def process_vlm_blocks_from_images(
     vlm_api_key: Optional[str] = "optional-api-key-here",
     vlm_prompts: Optional[Dict[str, str]] = None,
     output_dir: Path = None,
-    batch_size: int = 1
+    batch_size: int = 1,
+    vlm_cache_dir: Optional[Path] = None
 ) -> List[Path]:
     """
     이미 추출된 이미지 파일들을 읽어서 VLM 처리하고 JSON 업데이트
@@ -186,6 +249,9 @@ def process_vlm_blocks_from_images(
             None이면 클라이언트의 기본 프롬프트 사용
         output_dir: 출력 디렉토리 (None이면 원본 파일 덮어쓰기)
         batch_size: 배치 처리 크기 (1이면 개별 처리, >1이면 배치 처리)
+            배치 처리 시 VLM 요청을 batch_size개 스레드로 동시에 보냄 (하나가 끝나면 바로 다음 요청 전송)
+        vlm_cache_dir: VLM 응답 캐시 디렉토리 (vlm_client가 None일 때 자동 생성하는 클라이언트에 적용,
+            같은 이미지를 다시 처리하면 서버를 호출하지 않고 이전 응답을 사용)
     
     Returns:
         처리된 JSON 파일 경로 리스트
@@ -197,7 +263,7 @@ def process_vlm_blocks_from_images(
                 logger.error("VLM 클라이언트를 사용할 수 없습니다. VLM 처리를 건너뜁니다.")
                 return []
             logger.info(f"VLM 클라이언트 생성: {vlm_api_base} (API 키: {'설정됨' if vlm_api_key else '없음'})")
-            vlm_client = create_qwen3vl_client(api_base=vlm_api_base, api_key=vlm_api_key)
+            vlm_client = create_qwen3vl_client(api_base=vlm_api_base, api_key=vlm_api_key, cache_dir=vlm_cache_dir)
         
         # 프롬프트가 제공되지 않았으면 기본 프롬프트 사용
         if vlm_prompts is None:
@@ -240,102 +306,72 @@ def process_vlm_blocks_from_images(
             return []
         
         # JSON 파일들을 먼저 모두 로드 (중복 읽기 방지)
-        json_data_cache = {}
-        for json_file in json_files:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                json_data_cache[json_file.stem] = json.load(f)
+        # stem -> 경로 사전을 한 번만 만들어 두고 이미지마다 파일 시스템 대신 사전에서 찾음
+        json_path_by_stem = {json_file.stem: json_file for json_file in json_files}
+        json_data_cache = {stem: load_json(json_file) for stem, json_file in json_path_by_stem.items()}
+        # (block_idx, block_label) -> 블록 사전을 파일마다 한 번만 만들어 이미지마다 사전 조회로 블록을 찾음
+        # (저장할 JSON 데이터에는 넣지 않고 따로 보관)
+        block_index_by_stem = {
+            stem: {
+                (block_idx, block.get("block_label")): block
+                for block_idx, block in enumerate(data.get("parsing_res_list", []))
+            }
+            for stem, data in json_data_cache.items()
+        }
         
-        # 배치 단위로 처리
-        for i in range(0, len(all_images), batch_size):
-            batch = all_images[i:i+batch_size]
-            logger.info(f"배치 {i//batch_size + 1}/{(len(all_images) + batch_size - 1)//batch_size} 처리 중... ({len(batch)}개 이미지)")
+        # 이미지 경로와 블록을 먼저 모두 짝지어 둠
+        vlm_tasks = []
+        for img_info in all_images:
+            block_label = img_info["block_label"]
+            block_id = img_info["block_id"]
+            img_path = img_info["img_path"]
+            json_stem = img_info["json_stem"]
+            block_idx = img_info["block_idx"]
             
-            for img_info in batch:
-                block_label = img_info["block_label"]
-                block_id = img_info["block_id"]
-                img_path = img_info["img_path"]
-                json_stem = img_info["json_stem"]
-                block_idx = img_info["block_idx"]
-                
-                # JSON 파일 찾기 (json_stem이 이미 page_0001_0_res 형식이므로 .json만 추가)
-                json_file = parsing_results_dir / f"{json_stem}.json"
-                if not json_file.exists():
-                    # 다른 패턴 시도 (기존 패턴: {json_stem}_0_res.json도 확인)
-                    json_file_alt = parsing_results_dir / f"{json_stem}_0_res.json"
-                    if json_file_alt.exists():
-                        json_file = json_file_alt
-                        logger.debug(f"JSON 파일 찾음 (대체 패턴): {json_file.name}")
-                    else:
-                        # glob으로 패턴 매칭 시도
-                        json_files_matching = list(parsing_results_dir.glob(f"{json_stem}*_res.json"))
-                        if json_files_matching:
-                            json_file = json_files_matching[0]
-                            logger.debug(f"JSON 파일 찾음 (glob 패턴): {json_file.name}")
-                        else:
-                            logger.warning(f"JSON 파일을 찾을 수 없습니다: {json_stem}")
-                            logger.debug(f"  검색 디렉토리: {parsing_results_dir}")
-                            available_files = list(parsing_results_dir.glob("*_res.json"))
-                            logger.debug(f"  사용 가능한 JSON 파일 ({len(available_files)}개): {[f.name for f in available_files[:10]]}")
-                            continue
-                else:
-                    logger.debug(f"JSON 파일 찾음: {json_file.name}")
-                
-                # 캐시에서 JSON 데이터 가져오기
-                json_key = json_file.stem
-                if json_key not in json_data_cache:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        json_data_cache[json_key] = json.load(f)
-                
-                data = json_data_cache[json_key]
-                parsing_res_list = data.get("parsing_res_list", [])
-                
-                # block_idx로 블록 찾기
-                if 0 <= block_idx < len(parsing_res_list):
-                    block = parsing_res_list[block_idx]
-                    if block.get("block_label") == block_label:
-                        try:
-                            img = Image.open(img_path)
-                            logger.debug(f"이미지 로드 완료: {img_path.name} ({img.size})")
-                            
-                            vlm_function = vlm_functions.get(block_label) if vlm_functions else None
-                            if vlm_function:
-                                logger.info(f"VLM 처리 시작: {block_label} ({block_id})")
-                                content = vlm_function(img)
-                                block["block_content"] = content
-                                logger.info(f"VLM 처리 완료: {block_label} ({block_id}) - {len(content)} chars")
-                                # 처음 100자만 로그에 출력
-                                preview = content[:100] + "..." if len(content) > 100 else content
-                                logger.debug(f"  내용 미리보기: {preview}")
-                            else:
-                                logger.warning(f"VLM 함수 없음: {block_label} ({block_id})")
-                                block["block_content"] = "[VLM 함수 없음]"
-                        except Exception as e:
-                            logger.error(f"VLM 처리 실패 ({block_id}): {e}", exc_info=True)
-                            block["block_content"] = f"[VLM 처리 실패: {e}]"
-                    else:
-                        logger.warning(f"블록 라벨 불일치: 예상={block_label}, 실제={block.get('block_label')} ({block_id})")
-                else:
-                    logger.warning(f"블록 인덱스 범위 초과: block_idx={block_idx}, 리스트 길이={len(parsing_res_list)} ({block_id})")
+            # JSON 파일 찾기 (json_stem이 이미 page_0001_0_res 형식이므로 대부분 그대로 일치)
+            json_key = _resolve_json_stem(json_stem, json_path_by_stem)
+            if json_key is None:
+                logger.warning(f"JSON 파일을 찾을 수 없습니다: {json_stem}")
+                # 파일 목록 미리보기는 DEBUG일 때만 만듦 (찾지 못한 이미지마다 목록을 다시 자르지 않음)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("  검색 디렉토리: %s", parsing_results_dir)
+                    logger.debug("  사용 가능한 JSON 파일 (%d개): %s", len(json_files), [f.name for f in json_files[:10]])
+                continue
+            if json_key != json_stem:
+                logger.debug(f"JSON 파일 찾음 (대체 패턴): {json_path_by_stem[json_key].name}")
+            
+            # (block_idx, block_label)로 블록 찾기
+            block = block_index_by_stem[json_key].get((block_idx, block_label))
+            if block is not None:
+                vlm_tasks.append((block, img_path, block_label, block_id))
+                continue
+            
+            # 찾지 못한 경우에만 원인을 구분해 경고
+            parsing_res_list = json_data_cache[json_key].get("parsing_res_list", [])
+            if 0 <= block_idx < len(parsing_res_list):
+                logger.warning(f"블록 라벨 불일치: 예상={block_label}, 실제={parsing_res_list[block_idx].get('block_label')} ({block_id})")
+            else:
+                logger.warning(f"블록 인덱스 범위 초과: block_idx={block_idx}, 리스트 길이={len(parsing_res_list)} ({block_id})")
+        
+        # VLM 서버는 지연 시간이 대부분이므로 요청을 batch_size개 스레드로 동시에 보냄
+        # 배치마다 가장 느린 요청을 기다리지 않도록 모든 요청을 한 번에 넘기고,
+        # 요청 하나가 끝나면 바로 다음 요청이 들어가 항상 batch_size개가 진행 중이 되게 함
+        logger.info(f"VLM 요청 {len(vlm_tasks)}개를 동시 {batch_size}개씩 처리 중...")
+        with ThreadPoolExecutor(max_workers=batch_size) as executor:
+            # 결과는 메인 스레드에서 블록에 반영 (map으로 요청 순서 유지)
+            contents = executor.map(
+                lambda task: _run_vlm_on_image(task[1], task[2], task[3], vlm_functions),
+                vlm_tasks
+            )
+            for done_count, ((block, _, _, _), content) in enumerate(zip(vlm_tasks, contents), 1):
+                block["block_content"] = content
+                if done_count % batch_size == 0 or done_count == len(vlm_tasks):
+                    logger.info(f"VLM 처리 진행: {done_count}/{len(vlm_tasks)}")
         
         # 모든 JSON 파일 저장
         for json_file_stem, data in json_data_cache.items():
-            # json_file_stem이 이미 page_0001_0_res 형식이므로 .json만 추가
-            json_file_path = parsing_results_dir / f"{json_file_stem}.json"
-            if not json_file_path.exists():
-                # 다른 패턴 시도 (기존 패턴: {json_file_stem}_0_res.json도 확인)
-                json_file_path_alt = parsing_results_dir / f"{json_file_stem}_0_res.json"
-                if json_file_path_alt.exists():
-                    json_file_path = json_file_path_alt
-                    logger.debug(f"저장할 JSON 파일 찾음 (대체 패턴): {json_file_path.name}")
-                else:
-                    # glob으로 패턴 매칭 시도
-                    json_files_matching = list(parsing_results_dir.glob(f"{json_file_stem}*_res.json"))
-                    if json_files_matching:
-                        json_file_path = json_files_matching[0]
-                        logger.debug(f"저장할 JSON 파일 찾음 (glob 패턴): {json_file_path.name}")
-                    else:
-                        logger.warning(f"저장할 JSON 파일을 찾을 수 없습니다: {json_file_stem}")
-                        continue
+            # 캐시 키는 읽어 들인 파일의 stem이므로 경로를 그대로 다시 찾을 수 있음
+            json_file_path = json_path_by_stem[json_file_stem]
             
             if output_dir:
                 output_dir.mkdir(parents=True, exist_ok=True)
@@ -343,8 +379,7 @@ def process_vlm_blocks_from_images(
             else:
                 output_file = json_file_path
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            dump_json(data, output_file, pretty=True)
         
         # 처리된 파일 리스트 반환
         processed_files = list(parsing_results_dir.glob("*_res.json"))
@@ -359,26 +394,28 @@ def process_vlm_blocks_from_images(
     
     processed_files = []
     
+    # 타입별 폴더를 한 번씩만 훑어 두고 블록마다 img_path.exists()를 호출하는 대신 이름 집합에서 확인
+    png_names_by_label = {
+        label: set(_scan_png_names(vlm_images_dir / label))
+        for label in VLM_BLOCK_LABEL_ORDER
+    }
+    
     for json_file in json_files:
         logger.info(f"처리 중: {json_file.name}")
         
         # JSON 파일 읽기
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_json(json_file)
         
         parsing_res_list = data.get("parsing_res_list", [])
         json_stem = Path(json_file).stem  # page_0001_0_res
         
-        # VLM 처리 대상 블록 라벨
-        vlm_block_labels = ["table", "chart", "figure", "image", "formula"]
-        
         processed_count = 0
         vlm_block_count = 0
         for block_idx, block in enumerate(parsing_res_list):
             block_label = block.get("block_label", "")
             
             # VLM 처리 대상 블록만 처리
-            if block_label in vlm_block_labels:
+            if block_label in VLM_BLOCK_LABELS:
                 vlm_block_count += 1
                 # 이미지 파일 경로 생성 (vlm_images/{block_label}/ 폴더에서 찾기)
                 block_id = f"{json_stem}_block_{block_idx}"
@@ -386,29 +423,33 @@ def process_vlm_blocks_from_images(
                 img_filename = f"{block_id}.png"
                 img_path = type_dir / img_filename
                 
-                logger.debug(f"  VLM 블록 발견: {block_label} (block_idx={block_idx})")
-                logger.debug(f"  이미지 경로 확인: {img_path}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("  VLM 블록 발견: %s (block_idx=%d)", block_label, block_idx)
+                    logger.debug("  이미지 경로 확인: %s", img_path)
                 
-                if img_path.exists():
+                if img_filename in png_names_by_label[block_label]:
+                    # VLM 처리 (해당 블록 타입의 함수가 없으면 이미지를 디코딩하지 않고 건너뜀)
+                    vlm_function = vlm_functions.get(block_label) if vlm_functions else None
+                    if not vlm_function:
+                        logger.warning(f"VLM 함수 없음, 건너뜀: {block_label} ({block_id})")
+                        block["block_content"] = "[VLM 함수 없음]"
+                        continue
+                    
                     try:
                         # 이미지 파일 읽기
                         img = Image.open(img_path)
-                        logger.debug(f"이미지 로드 완료: {img_path.name} ({img.size})")
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("이미지 로드 완료: %s (%s)", img_path.name, img.size)
                         
-                        # VLM 처리 (해당 블록 타입의 함수가 제공된 경우)
-                        vlm_function = vlm_functions.get(block_label) if vlm_functions else None
-                        if vlm_function:
-                            logger.info(f"VLM 처리 시작: {block_label} ({block_id})")
-                            content = vlm_function(img)
-                            block["block_content"] = content
-                            processed_count += 1
-                            logger.info(f"VLM 처리 완료: {block_label} ({block_id}) - {len(content)} chars")
-                            # 처음 100자만 로그에 출력
+                        logger.info(f"VLM 처리 시작: {block_label} ({block_id})")
+                        content = vlm_function(img)
+                        block["block_content"] = content
+                        processed_count += 1
+                        logger.info(f"VLM 처리 완료: {block_label} ({block_id}) - {len(content)} chars")
+                        # 처음 100자만 로그에 출력 (DEBUG가 꺼져 있으면 미리보기 문자열을 만들지 않음)
+                        if logger.isEnabledFor(logging.DEBUG):
                             preview = content[:100] + "..." if len(content) > 100 else content
-                            logger.debug(f"  내용 미리보기: {preview}")
-                        else:
-                            logger.warning(f"VLM 함수 없음, 건너뜀: {block_label} ({block_id})")
-                            block["block_content"] = "[VLM 함수 없음]"
+                            logger.debug("  내용 미리보기: %s", preview)
                     except Exception as e:
                         logger.error(f"VLM 처리 실패 ({block_id}): {e}", exc_info=True)
                         block["block_content"] = f"[VLM 처리 실패: {e}]"
@@ -427,8 +468,7 @@ def process_vlm_blocks_from_images(
         else:
             output_file = json_file
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        dump_json(data, output_file, pretty=True)
         
         processed_files.append(output_file)
         logger.debug(f"저장 완료: {output_file.name}")
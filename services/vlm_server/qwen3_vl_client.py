@@ -1,43 +1,224 @@
 """Qwen3-VL API 클라이언트"""
 import base64
+import hashlib
+import sqlite3
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 from PIL import Image
 import io
 import json
+import logging
+import mmap
+import os
+
+try:
+    import pybase64
+except ImportError:  # pybase64 미설치 시 표준 base64 모듈 사용
+    pybase64 = None
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 표준 json 모듈 사용
+    orjson = None
+
+
+logger = logging.getLogger(__name__)
+
+# vLLM 서버에 올린 모델 이름 (docker-compose.yml의 --model과 일치해야 함)
+VLM_MODEL = "Qwen/Qwen3-VL-8B-Instruct"
+
+# 생성 파라미터 (모든 요청에 공통)
+VLM_MAX_TOKENS = 2048
+VLM_TEMPERATURE = 0.1
+
+# image_format별 data URL 접두사 (요청마다 포맷 문자열을 다시 만들지 않음)
+_DATA_URL_PREFIX = {"PNG": "data:image/png;base64,", "JPEG": "data:image/jpeg;base64,"}
+
+# 사진성 이미지(chart, figure, image)를 JPEG로 보낼 때의 품질
+# (table, formula는 글자 획이 뭉개지지 않도록 무손실 PNG 유지)
+JPEG_QUALITY = 85
+
+# 전송용 PNG의 zlib 압축 레벨 (1: 가장 빠름, 기본값 6보다 파일은 조금 커짐)
+PNG_COMPRESS_LEVEL = 1
+
+# chart, figure, image 전송 시 긴 변 최대 픽셀 수 (table, formula는 글자 판독을 위해 축소하지 않음)
+DEFAULT_MAX_IMAGE_SIDE = 1280
+
+# 세션 연결 풀 크기 (동시 요청 스레드 수보다 작으면 연결을 매번 새로 맺게 됨)
+HTTP_POOL_SIZE = 16
+
+
+def _b64encode_str(data: Union[bytes, memoryview, mmap.mmap]) -> str:
+    """바이트(또는 memoryview, mmap)를 base64 문자열로 인코딩 (pybase64가 있으면 SIMD 구현으로 바로 str 생성)"""
+    if pybase64 is not None:
+        return pybase64.b64encode_as_string(data)
+    return base64.b64encode(data).decode()
+
+
+def _dumps_request(payload: dict) -> bytes:
+    """요청 본문 직렬화 (orjson이 있으면 C 구현 사용, 이미지 base64 문자열을 빠르게 복사)"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+
+def _loads_response(content: bytes):
+    """응답 본문 파싱 (orjson이 있으면 C 구현 사용)"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _fit_max_side(img: Image.Image, max_side: Optional[int]) -> Image.Image:
+    """긴 변이 max_side를 넘으면 비율을 유지하며 축소한 복사본 반환 (호출 측 이미지는 변경하지 않음)"""
+    if not max_side or max(img.size) <= max_side:
+        return img
+    img = img.copy()
+    img.thumbnail((max_side, max_side), Image.LANCZOS)
+    return img
+
+
+def _build_payload(image_url: str, prompt: str) -> dict:
+    """
+    chat/completions 요청 payload 생성
+    
+    vlm_processor.process_vlm_blocks_from_images의 배치 모드(batch_size > 1)에서는
+    클라이언트 하나를 ThreadPoolExecutor의 여러 스레드가 함께 쓰므로 공유 템플릿을
+    고쳐 쓰지 않고 요청마다 새 사전을 만듦 (고정 값은 모듈 상수에서 가져옴)
+    """
+    # vLLM OpenAI 호환 API 형식 (공식 문서 참고)
+    # https://docs.vllm.ai/projects/recipes/en/latest/Qwen/Qwen3-VL.html#consume-the-openai-api-compatible-server
+    return {
+        "model": VLM_MODEL,
+        "messages": [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "image_url", "image_url": {"url": image_url}},
+                    {"type": "text", "text": prompt}
+                ]
+            }
+        ],
+        "max_tokens": VLM_MAX_TOKENS,
+        "temperature": VLM_TEMPERATURE
+    }
+
+
+def _payload_for_log(payload: dict) -> str:
+    """로그용 요청 payload 문자열 (수 MB인 base64 이미지 데이터는 길이만 남기고 생략)"""
+    messages = []
+    for message in payload.get("messages", []):
+        content = []
+        for part in message.get("content", []):
+            if part.get("type") == "image_url":
+                url = part["image_url"]["url"]
+                header, _, data = url.partition(",")
+                part = {**part, "image_url": {"url": f"{header},<{len(data)} chars 생략>"}}
+            content.append(part)
+        messages.append({**message, "content": content})
+    return json.dumps({**payload, "messages": messages}, ensure_ascii=False, indent=2)
 
 
 class Qwen3VLClient:
     """Qwen3-VL API 클라이언트"""
     
-    def __init__(self, api_base: str = "http://localhost:8888/v1", api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_base: str = "http://localhost:8888/v1",
+        api_key: Optional[str] = None,
+        max_image_side: Optional[int] = DEFAULT_MAX_IMAGE_SIDE,
+        cache_dir: Optional[Path] = None
+    ):
         """
         Qwen3-VL API 클라이언트 초기화
         
         Args:
             api_base: API 베이스 URL (기본값: http://localhost:8000/v1)
             api_key: API 키 (선택사항)
+            max_image_side: chart, figure, image 전송 전 긴 변 최대 픽셀 수 (None이면 축소하지 않음)
+                전송 크기와 VLM 시각 토큰 수가 픽셀 수에 비례하므로 큰 이미지는 줄여서 보냄
+            cache_dir: VLM 응답 캐시 디렉토리 (설정하면 같은 이미지+프롬프트 요청은 서버를 호출하지 않고
+                이전 응답을 재사용, 단계를 다시 실행할 때 VLM 처리 시간을 줄임)
         """
         self.api_base = api_base.rstrip('/')
         self.api_key = api_key
+        self.max_image_side = max_image_side
+        
+        # 응답 캐시 (sqlite 연결 하나를 스레드들이 잠금으로 나눠 씀)
+        self._cache_conn = None
+        self._cache_lock = threading.Lock()
+        if cache_dir is not None:
+            cache_dir = Path(cache_dir)
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            self._cache_conn = sqlite3.connect(str(cache_dir / "vlm_responses.sqlite3"), check_same_thread=False)
+            with self._cache_lock:
+                self._cache_conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, content TEXT NOT NULL)"
+                )
+                self._cache_conn.commit()
         self.headers = {
             "Content-Type": "application/json"
         }
         if api_key:
             self.headers["Authorization"] = f"Bearer {api_key}"
+        
+        # 요청마다 TCP 연결을 새로 맺지 않도록 keep-alive 세션을 재사용
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+    
+    def _encode_image(self, img: Image.Image, fp, image_format: str = "PNG") -> None:
+        """PIL Image를 fp(파일 경로 또는 파일 객체)에 image_format("PNG" 또는 "JPEG")으로 저장"""
+        if image_format == "JPEG":
+            # JPEG는 알파/팔레트를 지원하지 않으므로 RGB로 변환 (흑백은 그대로 저장 가능)
+            if img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            img.save(fp, format="JPEG", quality=JPEG_QUALITY, optimize=False)
+        else:
+            # 루프백으로 바로 보내는 일회용 이미지라 크기보다 인코딩 속도가 중요 (기본 6 대비 CPU 사용이 훨씬 적음)
+            img.save(fp, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
     
-    def _image_to_base64(self, img: Image.Image) -> str:
-        """PIL Image를 base64 문자열로 변환"""
+    def _image_to_base64(self, img: Image.Image, image_format: str = "PNG") -> str:
+        """PIL Image를 base64 문자열로 변환 (image_format: "PNG" 또는 "JPEG")"""
         buffered = io.BytesIO()
-        img.save(buffered, format="PNG")
-        img_str = base64.b64encode(buffered.getvalue()).decode()
+        self._encode_image(img, buffered, image_format)
+        # getvalue()로 PNG/JPEG 바이트를 한 번 더 복사하지 않고 내부 버퍼를 그대로 인코딩
+        with buffered.getbuffer() as view:
+            img_str = _b64encode_str(view)
         return img_str
     
+    def _cache_key(self, img: Image.Image, prompt: str, image_format: str) -> str:
+        """응답 캐시 키 (모델, 전송 형식, 전송할 이미지 픽셀, 프롬프트의 해시)"""
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"{VLM_MODEL}\0{image_format}\0{img.mode}\0{img.size}\0".encode('utf-8'))
+        digest.update(img.tobytes())
+        digest.update(prompt.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _cache_get(self, key: str) -> Optional[str]:
+        """캐시된 응답 조회 (없으면 None)"""
+        with self._cache_lock:
+            row = self._cache_conn.execute("SELECT content FROM responses WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def _cache_put(self, key: str, content: str) -> None:
+        """응답을 캐시에 저장"""
+        with self._cache_lock:
+            self._cache_conn.execute("INSERT OR REPLACE INTO responses (key, content) VALUES (?, ?)", (key, content))
+            self._cache_conn.commit()
+    
     def _image_path_to_base64(self, image_path: Path) -> str:
         """이미지 파일 경로를 base64 문자열로 변환"""
         with open(image_path, "rb") as f:
-            img_data = base64.b64encode(f.read()).decode()
+            # 파일을 bytes로 한 번 더 복사하지 않고 매핑한 페이지 캐시를 그대로 인코딩 (빈 파일은 매핑 불가)
+            if os.fstat(f.fileno()).st_size == 0:
+                return ""
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                img_data = _b64encode_str(mm)
         return img_data
     
     def process_table(self, img: Image.Image, prompt: Optional[str] = None) -> str:
@@ -75,7 +256,7 @@ class Qwen3VLClient:
                     차트의 주요 내용, 데이터 트렌드, 중요한 인사이트를 요약해주세요.
                     한국어로 작성해주세요."""
         
-        return self._process_image(img, prompt)
+        return self._process_image(img, prompt, image_format="JPEG", max_side=self.max_image_side)
     
     def process_figure(self, img: Image.Image, prompt: Optional[str] = None) -> str:
         """
@@ -93,7 +274,7 @@ class Qwen3VLClient:
                     그림의 주요 내용과 의미를 요약해주세요.
                     한국어로 작성해주세요."""
         
-        return self._process_image(img, prompt)
+        return self._process_image(img, prompt, image_format="JPEG", max_side=self.max_image_side)
     
     def process_image(self, img: Image.Image, prompt: Optional[str] = None) -> str:
         """
@@ -111,7 +292,7 @@ class Qwen3VLClient:
                     이미지의 주요 내용과 의미를 설명해주세요.
                     한국어로 작성해주세요."""
         
-        return self._process_image(img, prompt)
+        return self._process_image(img, prompt, image_format="JPEG", max_side=self.max_image_side)
     
     def process_formula(self, img: Image.Image, prompt: Optional[str] = None) -> str:
         """
@@ -133,74 +314,87 @@ class Qwen3VLClient:
         
         return self._process_image(img, prompt)
     
-    def _process_image(self, img: Image.Image, prompt: str) -> str:
+    def _process_image(
+        self,
+        img: Image.Image,
+        prompt: str,
+        image_format: str = "PNG",
+        max_side: Optional[int] = None
+    ) -> str:
         """
         이미지를 Qwen3-VL API로 처리
         
         Args:
             img: PIL Image 객체
             prompt: 처리 프롬프트
+            image_format: 전송 이미지 형식 ("PNG": 무손실, "JPEG": 사진성 이미지용으로 요청 크기가 작음)
+            max_side: 인코딩 전 긴 변 최대 픽셀 수 (None이면 원본 크기로 전송)
         
         Returns:
             모델 응답 텍스트
         """
-        import logging
-        logger = logging.getLogger(__name__)
+        # 이미지를 base64로 변환 (큰 이미지는 먼저 축소)
+        img = _fit_max_side(img, max_side)
         
-        # 이미지를 base64로 변환
-        img_base64 = self._image_to_base64(img)
-        logger.debug(f"이미지 base64 변환 완료: {len(img_base64)} chars")
-        logger.debug(f"프롬프트: {prompt[:100]}..." if len(prompt) > 100 else f"프롬프트: {prompt}")
+        # 같은 이미지+프롬프트로 이미 받은 응답이 있으면 서버를 호출하지 않음
+        cache_key = None
+        if self._cache_conn is not None:
+            cache_key = self._cache_key(img, prompt, image_format)
+            cached_content = self._cache_get(cache_key)
+            if cached_content is not None:
+                logger.info(f"VLM 응답 캐시 사용: {len(cached_content)} chars")
+                return cached_content
+        
+        img_base64 = self._image_to_base64(img, image_format)
+        logger.debug("이미지 base64 변환 완료: %d chars", len(img_base64))
+        return self._chat_completion(_DATA_URL_PREFIX[image_format] + img_base64, prompt, cache_key)
+    
+    def _chat_completion(self, image_url: str, prompt: str, cache_key: Optional[str] = None) -> str:
+        """
+        이미지 data URL과 프롬프트로 chat/completions 요청을 보내고 응답 텍스트 반환
+        
+        Args:
+            image_url: 전송할 이미지 URL
+            prompt: 처리 프롬프트
+            cache_key: 응답 캐시 키 (None이면 캐시에 저장하지 않음)
+        
+        Returns:
+            모델 응답 텍스트
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"프롬프트: {prompt[:100]}..." if len(prompt) > 100 else f"프롬프트: {prompt}")
         
         # Qwen3-VL API 요청 형식
         # 참고: Qwen3-VL은 멀티모달 모델이므로 messages API를 사용
         url = f"{self.api_base}/chat/completions"
-        
-        # vLLM OpenAI 호환 API 형식 (공식 문서 참고)
-        # https://docs.vllm.ai/projects/recipes/en/latest/Qwen/Qwen3-VL.html#consume-the-openai-api-compatible-server
-        payload = {
-            "model": "Qwen/Qwen3-VL-8B-Instruct",
-            "messages": [
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/png;base64,{img_base64}"
-                            }
-                        },
-                        {
-                            "type": "text",
-                            "text": prompt
-                        }
-                    ]
-                }
-            ],
-            "max_tokens": 2048,
-            "temperature": 0.1
-        }
+        payload = _build_payload(image_url, prompt)
         
         try:
             logger.info(f"VLM API 요청 전송: {url}")
-            logger.debug(f"요청 payload: {json.dumps(payload, ensure_ascii=False, indent=2)[:1000]}...")
-            response = requests.post(url, headers=self.headers, json=payload, timeout=120)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"요청 payload: {_payload_for_log(payload)[:1000]}...")
+            # 헤더에 Content-Type: application/json이 있으므로 직렬화한 바이트를 그대로 전송
+            response = self.session.post(url, headers=self.headers, data=_dumps_request(payload), timeout=120)
             
             # 에러 응답의 상세 내용 확인
             if not response.ok:
                 error_detail = response.text
                 logger.error(f"API 요청 실패 ({response.status_code}): {error_detail}")
-                logger.error(f"요청 payload: {json.dumps(payload, ensure_ascii=False, indent=2)}")
+                logger.error(f"요청 payload: {_payload_for_log(payload)}")
                 response.raise_for_status()
             
-            result = response.json()
-            logger.debug(f"API 응답 수신: {json.dumps(result, ensure_ascii=False, indent=2)[:500]}...")
+            result = _loads_response(response.content)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"API 응답 수신: {json.dumps(result, ensure_ascii=False, indent=2)[:500]}...")
             
             # 응답에서 텍스트 추출
             if "choices" in result and len(result["choices"]) > 0:
                 content = result["choices"][0]["message"]["content"]
                 logger.info(f"VLM 응답 수신: {len(content)} chars")
-                return content.strip()
+                content = content.strip()
+                if cache_key is not None:
+                    self._cache_put(cache_key, content)
+                return content
             else:
                 logger.error(f"예상치 못한 API 응답: {result}")
                 raise ValueError(f"Unexpected API response: {result}")
@@ -232,18 +426,30 @@ class Qwen3VLClient:
         return self._process_image(img, prompt)
 
 
-def create_qwen3vl_client(api_base: str = "http://localhost:8888/v1", api_key: Optional[str] = None) -> Qwen3VLClient:
+def create_qwen3vl_client(
+    api_base: str = "http://localhost:8888/v1",
+    api_key: Optional[str] = None,
+    max_image_side: Optional[int] = DEFAULT_MAX_IMAGE_SIDE,
+    cache_dir: Optional[Path] = None
+) -> Qwen3VLClient:
     """
     Qwen3-VL 클라이언트 생성 헬퍼 함수
     
     Args:
         api_base: API 베이스 URL
         api_key: API 키 (선택사항)
+        max_image_side: chart, figure, image 전송 전 긴 변 최대 픽셀 수 (None이면 축소하지 않음)
+        cache_dir: VLM 응답 캐시 디렉토리 (None이면 캐시하지 않음)
     
     Returns:
         Qwen3VLClient 인스턴스
     """
-    return Qwen3VLClient(api_base=api_base, api_key=api_key)
+    return Qwen3VLClient(
+        api_base=api_base,
+        api_key=api_key,
+        max_image_side=max_image_side,
+        cache_dir=cache_dir
+    )
 
 
 if __name__ == "__main__":
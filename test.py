@@ -5,8 +5,10 @@ main.py의 실행 단계를 선택해서 실행할 수 있습니다.
 원하는 단계만 선택해서 실행 가능합니다.
 """
 import sys
+import functools
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Set
+from typing import AbstractSet, FrozenSet, List
 import logging
 import time
 from datetime import timedelta
@@ -17,7 +19,6 @@ from object_parsing.hierarchy_parser import (
     DOC_TYPE_LAW
 )
 from object_parsing.section_exporter import process_section_export
-from object_parsing.text_extractor import process_all_json_files
 from object_parsing.vlm_processor import process_vlm_blocks_from_images
 from layout_parsing.html_generator import generate_html_from_json_files
 
@@ -44,7 +45,8 @@ class PipelineTestRunner:
         vlm_images_dir: Path = None,
         vlm_api_base: str = None,
         vlm_api_key: str = None,
-        vlm_batch_size: int = 10
+        vlm_batch_size: int = 10,
+        vlm_cache_dir: Path = None
     ):
         self.parsing_results_dir = parsing_results_dir
         self.pdf_pages_dir = pdf_pages_dir
@@ -56,6 +58,29 @@ class PipelineTestRunner:
         self.vlm_api_base = vlm_api_base
         self.vlm_api_key = vlm_api_key
         self.vlm_batch_size = vlm_batch_size
+        self.vlm_cache_dir = vlm_cache_dir
+        # 5단계에서 만든 트리 사전 (같은 실행에서 6단계가 파일을 다시 읽지 않도록 보관)
+        self.hierarchy_tree = None
+    
+    @contextmanager
+    def _timed(self, label: str):
+        """
+        단계 실행 시간 측정 및 완료/실패 로그
+        
+        time.time() 대신 단조 시계(time.perf_counter)를 사용해 시스템 시간 변경에 영향받지 않음
+        
+        Args:
+            label: 단계 이름 (예: "VLM 처리" → "✅ VLM 처리 완료", "VLM 처리 실패: ...")
+        """
+        step_start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            logger.error(f"{label} 실패: {e}", exc_info=True)
+            raise
+        step_elapsed = time.perf_counter() - step_start
+        logger.info(f"✅ {label} 완료")
+        logger.info(f"  ⏱️  소요 시간: {timedelta(seconds=int(step_elapsed))} ({step_elapsed:.2f}초)")
     
     def run_step3_vlm_processing(self) -> List[Path]:
         """
@@ -74,8 +99,7 @@ class PipelineTestRunner:
                 "먼저 VLM 이미지 추출을 완료하세요."
             )
         
-        step_start = time.time()
-        try:
+        with self._timed("VLM 처리"):
             processed_files = process_vlm_blocks_from_images(
                 parsing_results_dir=self.parsing_results_dir,
                 vlm_images_dir=self.vlm_images_dir,
@@ -85,17 +109,11 @@ class PipelineTestRunner:
                 vlm_api_key=self.vlm_api_key,
                 vlm_prompts=None,  # None이면 기본값 사용
                 output_dir=None,  # 원본 파일 덮어쓰기
-                batch_size=self.vlm_batch_size
+                batch_size=self.vlm_batch_size,
+                vlm_cache_dir=self.vlm_cache_dir
             )
-            step_elapsed = time.time() - step_start
-            logger.info("✅ VLM 처리 완료")
-            logger.info(f"  ⏱️  소요 시간: {timedelta(seconds=int(step_elapsed))} ({step_elapsed:.2f}초)")
-            logger.info(f"  처리된 파일 수: {len(processed_files)}개")
-            return processed_files
-        except Exception as e:
-            step_elapsed = time.time() - step_start
-            logger.error(f"VLM 처리 실패: {e}", exc_info=True)
-            raise
+        logger.info(f"  처리된 파일 수: {len(processed_files)}개")
+        return processed_files
     
     def run_step4_html_generation(self) -> int:
         """
@@ -108,21 +126,13 @@ class PipelineTestRunner:
         logger.info("4단계: HTML 생성 (JSON → HTML 변환)")
         logger.info("=" * 80)
         
-        step_start = time.time()
-        try:
+        with self._timed("HTML 생성"):
             html_count = generate_html_from_json_files(
                 parsing_results_dir=self.parsing_results_dir
             )
-            step_elapsed = time.time() - step_start
-            logger.info("✅ HTML 생성 완료")
-            logger.info(f"  ⏱️  소요 시간: {timedelta(seconds=int(step_elapsed))} ({step_elapsed:.2f}초)")
-            logger.info(f"  생성된 HTML 파일 수: {html_count}개")
-            logger.info(f"  HTML 저장 위치: {self.parsing_results_dir}")
-            return html_count
-        except Exception as e:
-            step_elapsed = time.time() - step_start
-            logger.error(f"HTML 생성 실패: {e}", exc_info=True)
-            raise
+        logger.info(f"  생성된 HTML 파일 수: {html_count}개")
+        logger.info(f"  HTML 저장 위치: {self.parsing_results_dir}")
+        return html_count
     
     def run_step5_hierarchy_parsing(self) -> tuple[Path, Path]:
         """
@@ -135,23 +145,15 @@ class PipelineTestRunner:
         logger.info("5단계: 계층 구조 파싱 (조항호목)")
         logger.info("=" * 80)
         
-        step_start = time.time()
-        try:
-            hierarchy_main_file, hierarchy_ref_file = process_hierarchy_parsing(
+        with self._timed("계층 구조 파싱"):
+            hierarchy_main_file, hierarchy_ref_file, self.hierarchy_tree = process_hierarchy_parsing(
                 parsing_results_dir=self.parsing_results_dir,
                 output_file=self.hierarchy_output_file,
                 doc_type=self.doc_type
             )
-            step_elapsed = time.time() - step_start
-            logger.info("✅ 계층 구조 파싱 완료")
-            logger.info(f"  ⏱️  소요 시간: {timedelta(seconds=int(step_elapsed))} ({step_elapsed:.2f}초)")
-            logger.info(f"  메인 파일: {hierarchy_main_file}")
-            logger.info(f"  참조 파일: {hierarchy_ref_file}")
-            return hierarchy_main_file, hierarchy_ref_file
-        except Exception as e:
-            step_elapsed = time.time() - step_start
-            logger.error(f"계층 구조 파싱 실패: {e}", exc_info=True)
-            raise
+        logger.info(f"  메인 파일: {hierarchy_main_file}")
+        logger.info(f"  참조 파일: {hierarchy_ref_file}")
+        return hierarchy_main_file, hierarchy_ref_file
     
     def run_step6_section_export(self) -> Path:
         """
@@ -170,31 +172,24 @@ class PipelineTestRunner:
                 "먼저 5단계(계층 구조 파싱)를 실행하세요."
             )
         
-        step_start = time.time()
-        try:
+        with self._timed("섹션별 내보내기"):
             section_meta_file = process_section_export(
                 hierarchy_json_path=self.hierarchy_output_file,
-                output_dir=self.neo4j_export_dir
+                output_dir=self.neo4j_export_dir,
+                hierarchy_data=self.hierarchy_tree
             )
-            step_elapsed = time.time() - step_start
-            logger.info("✅ 섹션별 내보내기 완료")
-            logger.info(f"  ⏱️  소요 시간: {timedelta(seconds=int(step_elapsed))} ({step_elapsed:.2f}초)")
-            logger.info(f"  문서 메타 파일: {section_meta_file}")
-            logger.info(f"  출력 디렉토리: {self.neo4j_export_dir}")
-            return section_meta_file
-        except Exception as e:
-            step_elapsed = time.time() - step_start
-            logger.error(f"섹션별 내보내기 실패: {e}", exc_info=True)
-            raise
+        logger.info(f"  문서 메타 파일: {section_meta_file}")
+        logger.info(f"  출력 디렉토리: {self.neo4j_export_dir}")
+        return section_meta_file
     
-    def run_steps(self, steps: Set[int]):
+    def run_steps(self, steps: AbstractSet[int]):
         """
         선택한 단계들 실행
         
         Args:
             steps: 실행할 단계 번호 집합 (예: {5, 6})
         """
-        total_start = time.time()
+        total_start = time.perf_counter()
         
         logger.info("=" * 80)
         logger.info("파이프라인 테스트 시작")
@@ -233,7 +228,7 @@ class PipelineTestRunner:
                 'meta_file': section_meta_file
             }
         
-        total_elapsed = time.time() - total_start
+        total_elapsed = time.perf_counter() - total_start
         
         logger.info("\n" + "=" * 80)
         logger.info("파이프라인 테스트 완료!")
@@ -244,7 +239,8 @@ class PipelineTestRunner:
         return results
 
 
-def parse_step_selection(selection_str: str) -> Set[int]:
+@functools.lru_cache(maxsize=32)
+def parse_step_selection(selection_str: str) -> FrozenSet[int]:
     """
     단계 선택 문자열 파싱
     
@@ -252,9 +248,11 @@ def parse_step_selection(selection_str: str) -> Set[int]:
     - "5,6" -> {5, 6}
     - "5-6" -> {5, 6}
     - "5" -> {5}
+    
+    같은 문자열을 다시 파싱하지 않도록 결과를 캐시하므로 변경 불가능한 frozenset 반환
     """
     if not selection_str:
-        return set()
+        return frozenset()
     
     selected = set()
     parts = selection_str.split(',')
@@ -271,7 +269,7 @@ def parse_step_selection(selection_str: str) -> Set[int]:
             # 단일 번호
             selected.add(int(part.strip()))
     
-    return selected
+    return frozenset(selected)
 
 
 def main():
@@ -369,6 +367,12 @@ def main():
         default=10,
         help="VLM 배치 크기 (Step 3에서 사용)"
     )
+    parser.add_argument(
+        '--vlm-cache-dir',
+        type=str,
+        default=None,
+        help="VLM 응답 캐시 디렉토리 (Step 3 재실행 시 같은 이미지는 서버를 호출하지 않음)"
+    )
     
     args = parser.parse_args()
     
@@ -388,7 +392,7 @@ def main():
     
     # 유효한 단계 확인
     valid_steps = {3, 4, 5, 6}
-    invalid_steps = selected_steps - valid_steps
+    invalid_steps = set(selected_steps) - valid_steps
     if invalid_steps:
         logger.error(f"유효하지 않은 단계: {invalid_steps}. 가능한 단계: {valid_steps}")
         return
@@ -407,7 +411,8 @@ def main():
         vlm_images_dir=vlm_images_dir,
         vlm_api_base=args.vlm_api_base,
         vlm_api_key=args.vlm_api_key,
-        vlm_batch_size=args.vlm_batch_size
+        vlm_batch_size=args.vlm_batch_size,
+        vlm_cache_dir=Path(args.vlm_cache_dir) if args.vlm_cache_dir else None
     )
     
     # 실행